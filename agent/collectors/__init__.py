@@ -1,5 +1,6 @@
 from agent.collectors.base import Collector
 from agent.collectors.common import (
+    CollectionContext,
     FilewatchCollector,
     NetworkCollector,
     PersistenceCollector,
@@ -9,6 +10,7 @@ from agent.collectors.common import (
 
 __all__ = [
     "Collector",
+    "CollectionContext",
     "ProcessCollector",
     "NetworkCollector",
     "PersistenceCollector",
@@ -1,25 +1,187 @@
 from __future__ import annotations
 
 import csv
-import io
-import json
 import os
+import re
 import subprocess
+import sys
+import threading
+import time
+from collections.abc import Iterator
 from datetime import UTC, datetime
 from pathlib import Path
-from typing import Any
+from typing import IO, Any
 
+import orjson
 import psutil
 
 from shared.enums import Platform, Severity, Source
 from shared.schemas import EventEnvelope
 
+# psutil>=6 keeps Process objects cached between process_iter() calls; we reset that cache
+# periodically so long-running daemons do not hold on to entries forever.
+_PROCESS_ITER_CACHE_CLEAR = getattr(psutil.process_iter, "cache_clear", None)
+PROCESS_CACHE_TTL_SECONDS = 300.0
+_process_cache_lock = threading.Lock()
+_last_process_cache_clear = time.monotonic()
+# Process names and usernames repeat heavily across processes and cycles; interning them keeps
+# one copy per distinct value. Bounded so a host with churny names cannot grow it forever.
+INTERN_CACHE_MAX = 4096
+_interned: dict[str, str] = {}
+# Float seconds near today's epoch only resolve to ~240ns, so a converted legacy filewatch
+# mtime can land just below the real st_mtime_ns; 1ms of slack absorbs that.
+LEGACY_MTIME_SLACK_NS = 1_000_000
+
 
 def _is_non_local_bind(ip: str) -> bool:
     stripped = ip.strip().lower()
     return stripped not in {"127.0.0.1", "::1", "localhost", ""}
 
 
+def _compile_markers(markers: list[str]) -> re.Pattern[str] | None:
+    """Fold substring markers into one alternation so each value is scanned once."""
+    cleaned = sorted({marker for marker in markers if marker}, key=len, reverse=True)
+    if not cleaned:
+        return None
+    return re.compile("|".join(re.escape(marker) for marker in cleaned))
+
+
+def _maybe_clear_process_cache() -> None:
+    global _last_process_cache_clear
+    if _PROCESS_ITER_CACHE_CLEAR is None:
+        return
+    with _process_cache_lock:
+        now = time.monotonic()
+        if now - _last_process_cache_clear > PROCESS_CACHE_TTL_SECONDS:
+            _PROCESS_ITER_CACHE_CLEAR()
+            _last_process_cache_clear = now
+
+
+def _intern(value: str) -> str:
+    cached = _interned.get(value)
+    if cached is not None:
+        return cached
+    if len(_interned) >= INTERN_CACHE_MAX:
+        return value
+    interned = sys.intern(value)
+    _interned[interned] = interned
+    return interned
+
+
+def _process_info(proc: psutil.Process) -> dict[str, Any] | None:
+    """Read the fields we report in one ``oneshot()`` so psutil can reuse its cached reads."""
+    info: dict[str, Any] = {"pid": proc.pid}
+    try:
+        with proc.oneshot():
+            # ZombieProcess subclasses NoSuchProcess; zombies are kept with default fields,
+            # as process_iter(attrs=...) did, rather than dropped by the handler below.
+            try:
+                info["name"] = _intern(proc.name())
+            except (psutil.AccessDenied, psutil.ZombieProcess, OSError):
+                info["name"] = "unknown"
+            try:
+                info["exe"] = proc.exe()
+            except (psutil.AccessDenied, psutil.ZombieProcess, OSError):
+                info["exe"] = ""
+            try:
+                info["username"] = _intern(proc.username())
+            except (psutil.AccessDenied, psutil.ZombieProcess, OSError, KeyError):
+                info["username"] = "unknown"
+    except psutil.NoSuchProcess:
+        return None
+    except (psutil.AccessDenied, OSError):
+        info.setdefault("name", "unknown")
+    return info
+
+
+def _iter_process_info() -> Iterator[dict[str, Any]]:
+    _maybe_clear_process_cache()
+    for proc in psutil.process_iter():
+        info = _process_info(proc)
+        if info is not None:
+            yield info
+
+
+class StreamedCommand:
+    """Runs a fixed command with piped stdout and kills it if it outlives ``timeout_seconds``.
+
+    Callers iterate ``stdout`` and may stop early; ``close()`` reaps the child and returns its
+    exit code. Pass ``stop=False`` after reading to EOF so a child that closed stdout but has
+    not exited yet is waited for (still bounded by the timeout) instead of terminated.
+    """
+
+    def __init__(self, args: list[str], timeout_seconds: float, **popen_kwargs: Any) -> None:
+        self._proc = subprocess.Popen(
+            args,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            **popen_kwargs,
+        )
+        self._timed_out = threading.Event()
+        self._timer = threading.Timer(timeout_seconds, self._kill)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _kill(self) -> None:
+        self._timed_out.set()
+        self._proc.kill()
+
+    @property
+    def stdout(self) -> IO[Any]:
+        if self._proc.stdout is None:
+            raise RuntimeError("command stdout is not piped")
+        return self._proc.stdout
+
+    @property
+    def timed_out(self) -> bool:
+        return self._timed_out.is_set()
+
+    def close(self, *, stop: bool = True) -> int:
+        if not stop:
+            # The armed timer still kills the child if it overruns the deadline.
+            self._proc.wait()
+        self._timer.cancel()
+        if self._proc.poll() is None:
+            self._proc.terminate()
+        try:
+            return_code = self._proc.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            self._proc.kill()
+            return_code = self._proc.wait()
+        if self._proc.stdout is not None:
+            self._proc.stdout.close()
+        return return_code
+
+
+class CollectionContext:
+    """Per-cycle state shared by collectors so the process table is walked only once."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._processes: list[dict[str, Any]] | None = None
+        self._pid_name: dict[int, str] = {}
+
+    def processes(self) -> list[dict[str, Any]]:
+        with self._lock:
+            if self._processes is None:
+                self._processes = list(_iter_process_info())
+                self._pid_name = {
+                    int(info.get("pid") or 0): str(info.get("name") or "unknown")
+                    for info in self._processes
+                }
+            return self._processes
+
+    def pid_name(self) -> dict[int, str]:
+        self.processes()
+        return self._pid_name
+
+    def reset(self) -> None:
+        """Drop the snapshot so the next cycle walks the process table again."""
+        with self._lock:
+            self._processes = None
+            self._pid_name = {}
+
+
 class ProcessCollector:
     def __init__(
         self,
@@ -27,32 +189,48 @@ class ProcessCollector:
         deny_process_names: list[str] | None = None,
         unusual_exec_paths: list[str] | None = None,
         max_events: int = 150,
+        context: CollectionContext | None = None,
     ) -> None:
         self.platform = platform
         self.deny_process_names = {name.lower() for name in (deny_process_names or [])}
         self.unusual_exec_paths = [path.lower() for path in (unusual_exec_paths or [])]
+        self._unusual_exec_re = _compile_markers(self.unusual_exec_paths)
+        self._lowered: dict[str, str] = {}
         self.max_events = max_events
+        self.context = context
+
+    def _lower(self, value: str) -> str:
+        # Names and exe paths repeat across processes and cycles; lower each distinct value once.
+        lowered = self._lowered.get(value)
+        if lowered is None:
+            lowered = value.lower()
+            if len(self._lowered) < INTERN_CACHE_MAX:
+                self._lowered[value] = lowered
+        return lowered
+
+    def _severity_for(self, name: str, exe: str) -> Severity:
+        if self.deny_process_names and self._lower(name) in self.deny_process_names:
+            return Severity.HIGH
+        if exe and self._unusual_exec_re is not None:
+            if self._unusual_exec_re.search(self._lower(exe)):
+                return Severity.WARN
+        return Severity.INFO
 
     def collect(self) -> list[EventEnvelope]:
+        now = datetime.now(UTC)
         events: list[EventEnvelope] = []
-        for proc in psutil.process_iter(attrs=["pid", "name", "exe", "username"]):
+        records = self.context.processes() if self.context is not None else _iter_process_info()
+        for info in records:
             if len(events) >= self.max_events:
                 break
-            info = proc.info
             name = str(info.get("name") or "unknown")
             exe = str(info.get("exe") or "")
             username = str(info.get("username") or "unknown")
-            severity = Severity.INFO
-            if name.lower() in self.deny_process_names:
-                severity = Severity.HIGH
-            elif exe and any(marker in exe.lower() for marker in self.unusual_exec_paths):
-                severity = Severity.WARN
-
             events.append(
                 EventEnvelope(
-                    ts=datetime.now(UTC),
+                    ts=now,
                     source=Source.PROCESS,
-                    severity=severity,
+                    severity=self._severity_for(name, exe),
                     platform=self.platform,
                     title="process_seen",
                     details_json={
@@ -67,18 +245,33 @@ class ProcessCollector:
 
 
 class NetworkCollector:
-    def __init__(self, platform: Platform, max_events: int = 150) -> None:
+    def __init__(
+        self,
+        platform: Platform,
+        max_events: int = 150,
+        context: CollectionContext | None = None,
+    ) -> None:
         self.platform = platform
         self.max_events = max_events
+        self.context = context
+
+    def _process_name(self, pid: int) -> str:
+        if self.context is not None:
+            return self.context.pid_name().get(pid, "unknown")
+        try:
+            return str(psutil.Process(pid).name())
+        except (psutil.NoSuchProcess, psutil.AccessDenied, OSError):
+            return "unknown"
 
     def collect(self) -> list[EventEnvelope]:
+        now = datetime.now(UTC)
         events: list[EventEnvelope] = []
         try:
             conns = psutil.net_connections(kind="inet")
         except (psutil.AccessDenied, OSError):
             return [
                 EventEnvelope(
-                    ts=datetime.now(UTC),
+                    ts=now,
                     source=Source.SYSTEM,
                     severity=Severity.WARN,
                     platform=self.platform,
@@ -94,17 +287,12 @@ class NetworkCollector:
                 continue
             laddr_ip = str(getattr(conn.laddr, "ip", ""))
             laddr_port = int(getattr(conn.laddr, "port", 0))
-            process_name = "unknown"
-            if conn.pid:
-                try:
-                    process_name = psutil.Process(conn.pid).name()
-                except (psutil.NoSuchProcess, psutil.AccessDenied, OSError):
-                    process_name = "unknown"
+            process_name = self._process_name(conn.pid) if conn.pid else "unknown"
 
             non_local = _is_non_local_bind(laddr_ip)
             events.append(
                 EventEnvelope(
-                    ts=datetime.now(UTC),
+                    ts=now,
                     source=Source.NETWORK,
                     severity=Severity.WARN if non_local else Severity.INFO,
                     platform=self.platform,
@@ -121,54 +309,63 @@ class NetworkCollector:
         return events
 
 
+def _macos_persistence_roots() -> list[Path]:
+    return [
+        Path.home() / "Library" / "LaunchAgents",
+        Path("/Library/LaunchAgents"),
+    ]
+
+
+def _windows_persistence_roots() -> list[Path]:
+    appdata = Path(os.getenv("APPDATA", str(Path.home() / "AppData" / "Roaming")))
+    program_data = Path(os.getenv("PROGRAMDATA", "C:\\ProgramData"))
+    return [
+        appdata / "Microsoft" / "Windows" / "Start Menu" / "Programs" / "Startup",
+        program_data / "Microsoft" / "Windows" / "Start Menu" / "Programs" / "Startup",
+    ]
+
+
 class PersistenceCollector:
     def __init__(self, platform: Platform, max_events: int = 80) -> None:
         self.platform = platform
         self.max_events = max_events
-
-    def _macos_paths(self) -> list[Path]:
-        return [
-            Path.home() / "Library" / "LaunchAgents",
-            Path("/Library/LaunchAgents"),
-        ]
-
-    def _windows_paths(self) -> list[Path]:
-        appdata = Path(os.getenv("APPDATA", str(Path.home() / "AppData" / "Roaming")))
-        program_data = Path(os.getenv("PROGRAMDATA", "C:\\ProgramData"))
-        return [
-            appdata / "Microsoft" / "Windows" / "Start Menu" / "Programs" / "Startup",
-            program_data / "Microsoft" / "Windows" / "Start Menu" / "Programs" / "Startup",
-        ]
+        if platform == Platform.WINDOWS:
+            self.roots = _windows_persistence_roots()
+        else:
+            self.roots = _macos_persistence_roots()
 
     def collect(self) -> list[EventEnvelope]:
-        roots = self._windows_paths() if self.platform == Platform.WINDOWS else self._macos_paths()
+        now = datetime.now(UTC)
         events: list[EventEnvelope] = []
-        for root in roots:
-            if not root.exists() or not root.is_dir():
+        for root in self.roots:
+            try:
+                entries = os.scandir(root)
+            except OSError:
                 continue
-            for path in root.iterdir():
-                if len(events) >= self.max_events:
-                    return events
-                if not path.is_file():
-                    continue
-                try:
-                    stat = path.stat()
-                except OSError:
-                    continue
-                events.append(
-                    EventEnvelope(
-                        ts=datetime.now(UTC),
-                        source=Source.SYSTEM,
-                        severity=Severity.INFO,
-                        platform=self.platform,
-                        title="persistence_artifact_seen",
-                        details_json={
-                            "path": str(path),
-                            "mtime": float(stat.st_mtime),
-                            "kind": "startup_entry",
-                        },
+            with entries:
+                for entry in entries:
+                    if len(events) >= self.max_events:
+                        return events
+                    try:
+                        if not entry.is_file():
+                            continue
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    events.append(
+                        EventEnvelope(
+                            ts=now,
+                            source=Source.SYSTEM,
+                            severity=Severity.INFO,
+                            platform=self.platform,
+                            title="persistence_artifact_seen",
+                            details_json={
+                                "path": entry.path,
+                                "mtime": float(stat.st_mtime),
+                                "kind": "startup_entry",
+                            },
+                        )
                     )
-                )
         return events
 
 
@@ -181,11 +378,11 @@ class ScheduledTaskCollector:
         self.max_events = max_events
 
     def _collect_macos(self) -> list[EventEnvelope]:
+        now = datetime.now(UTC)
         try:
             result = subprocess.run(
                 [self.CRONTAB_BIN, "-l"],
                 capture_output=True,
-                text=True,
                 check=False,
                 timeout=5,
             )
@@ -198,12 +395,16 @@ class ScheduledTaskCollector:
         for line in result.stdout.splitlines():
             if len(events) >= self.max_events:
                 break
-            entry = line.strip()
-            if not entry or entry.startswith("#"):
+            # Blank lines and comments are the bulk of most crontabs; reject them before stripping.
+            if not line or line[:1] == b"#":
                 continue
+            raw_entry = line.strip()
+            if not raw_entry or raw_entry[:1] == b"#":
+                continue
+            entry = raw_entry.decode("utf-8", errors="replace")
             events.append(
                 EventEnvelope(
-                    ts=datetime.now(UTC),
+                    ts=now,
                     source=Source.SYSTEM,
                     severity=Severity.INFO,
                     platform=Platform.MACOS,
@@ -214,39 +415,50 @@ class ScheduledTaskCollector:
         return events
 
     def _collect_windows(self) -> list[EventEnvelope]:
+        now = datetime.now(UTC)
         try:
-            result = subprocess.run(
+            command = StreamedCommand(
                 [self.SCHTASKS_BIN, "/Query", "/FO", "CSV", "/NH"],
-                capture_output=True,
-                text=True,
-                check=False,
-                timeout=8,
+                timeout_seconds=8,
+                encoding="utf-8",
+                errors="replace",
+                newline="",
             )
-        except (OSError, subprocess.TimeoutExpired, PermissionError):
-            return []
-        if result.returncode != 0:
+        except (OSError, PermissionError):
             return []
 
-        reader = csv.reader(io.StringIO(result.stdout))
         events: list[EventEnvelope] = []
-        for row in reader:
-            if len(events) >= self.max_events:
-                break
-            if not row:
-                continue
-            task_name = str(row[0]).strip() if row else ""
-            if not task_name:
-                continue
-            events.append(
-                EventEnvelope(
-                    ts=datetime.now(UTC),
-                    source=Source.SYSTEM,
-                    severity=Severity.INFO,
-                    platform=Platform.WINDOWS,
-                    title="scheduled_task_seen",
-                    details_json={"scheduler": "windows_task_scheduler", "task_name": task_name[:256]},
+        stopped_early = False
+        drained = False
+        try:
+            for row in csv.reader(command.stdout):
+                if not row:
+                    continue
+                task_name = str(row[0]).strip()
+                if not task_name:
+                    continue
+                events.append(
+                    EventEnvelope(
+                        ts=now,
+                        source=Source.SYSTEM,
+                        severity=Severity.INFO,
+                        platform=Platform.WINDOWS,
+                        title="scheduled_task_seen",
+                        details_json={
+                            "scheduler": "windows_task_scheduler",
+                            "task_name": task_name[:256],
+                        },
+                    )
                 )
-            )
+                if len(events) >= self.max_events:
+                    stopped_early = True
+                    break
+            else:
+                drained = True
+        finally:
+            return_code = command.close(stop=not drained)
+        if command.timed_out or (not stopped_early and return_code != 0):
+            return []
         return events
 
     def collect(self) -> list[EventEnvelope]:
@@ -262,55 +474,75 @@ class FilewatchCollector:
         self.state_path = state_path
         self.max_events = max_events
 
-    def _load_state(self) -> dict[str, float]:
+    def _load_state(self) -> dict[str, int]:
         if not self.state_path.exists():
             return {}
         try:
-            payload = json.loads(self.state_path.read_text(encoding="utf-8"))
-        except json.JSONDecodeError:
+            payload = orjson.loads(self.state_path.read_bytes())
+        except orjson.JSONDecodeError:
             return {}
         if not isinstance(payload, dict):
             return {}
-        output: dict[str, float] = {}
+        # State holds st_mtime_ns integers. Older state files stored float seconds, which are
+        # converted with a little slack for float rounding so upgrading reports no changes.
+        state: dict[str, int] = {}
         for key, value in payload.items():
-            if isinstance(value, (int, float)):
-                output[str(key)] = float(value)
-        return output
+            if isinstance(value, bool):
+                continue
+            if isinstance(value, int):
+                state[str(key)] = value
+            elif isinstance(value, float):
+                state[str(key)] = int(value * 1_000_000_000) + LEGACY_MTIME_SLACK_NS
+        return state
 
-    def _save_state(self, state: dict[str, float]) -> None:
+    def _save_state(self, state: dict[str, int]) -> None:
         self.state_path.parent.mkdir(parents=True, exist_ok=True)
-        self.state_path.write_text(json.dumps(state, ensure_ascii=True, separators=(",", ":")), encoding="utf-8")
+        self.state_path.write_bytes(orjson.dumps(state))
 
-    def _iter_files(self) -> dict[str, float]:
-        current: dict[str, float] = {}
+    def _iter_files(self) -> dict[str, int]:
+        current: dict[str, int] = {}
+        limit = self.max_events * 5
         for root in self.watch_paths:
-            if not root.exists() or not root.is_dir():
+            if not root.is_dir():
                 continue
-            for path in root.rglob("*"):
-                if len(current) >= self.max_events * 5:
-                    return current
-                if not path.is_file():
-                    continue
+            stack = [str(root)]
+            while stack:
                 try:
-                    stat = path.stat()
+                    entries = os.scandir(stack.pop())
                 except OSError:
                     continue
-                current[str(path)] = float(stat.st_mtime)
+                with entries:
+                    for entry in entries:
+                        if len(current) >= limit:
+                            return current
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path)
+                                continue
+                            # Symlinked files are followed, as Path.is_file()/stat() did.
+                            if not entry.is_file():
+                                continue
+                            stat = entry.stat()
+                        except OSError:
+                            continue
+                        current[entry.path] = stat.st_mtime_ns
         return current
 
     def collect(self) -> list[EventEnvelope]:
+        now = datetime.now(UTC)
         previous = self._load_state()
         current = self._iter_files()
         events: list[EventEnvelope] = []
 
-        for file_path, mtime in current.items():
+        for file_path, mtime_ns in current.items():
             if len(events) >= self.max_events:
                 break
             prev = previous.get(file_path)
+            mtime = mtime_ns / 1_000_000_000
             if prev is None:
                 events.append(
                     EventEnvelope(
-                        ts=datetime.now(UTC),
+                        ts=now,
                         source=Source.FILEWATCH,
                         severity=Severity.INFO,
                         platform=self.platform,
@@ -318,10 +550,10 @@ class FilewatchCollector:
                         details_json={"path": file_path, "mtime": mtime},
                     )
                 )
-            elif mtime > prev:
+            elif mtime_ns > prev:
                 events.append(
                     EventEnvelope(
-                        ts=datetime.now(UTC),
+                        ts=now,
                         source=Source.FILEWATCH,
                         severity=Severity.INFO,
                         platform=self.platform,
@@ -5,6 +5,7 @@ from pathlib import Path
 
 from agent.collectors.base import Collector
 from agent.collectors.common import (
+    CollectionContext,
     FilewatchCollector,
     NetworkCollector,
     PersistenceCollector,
@@ -23,16 +24,25 @@ def current_platform() -> Platform:
     return Platform.MACOS
 
 
-def build_collectors(config: AgentConfig) -> list[Collector]:
+def build_collectors(
+    config: AgentConfig,
+    context: CollectionContext | None = None,
+) -> list[Collector]:
     platform = current_platform()
+    context = context or CollectionContext()
     collectors: list[Collector] = [
         ProcessCollector(
             platform=platform,
             deny_process_names=config.deny_process_names,
             unusual_exec_paths=config.unusual_exec_paths,
             max_events=min(150, config.max_batch_events),
+            context=context,
+        ),
+        NetworkCollector(
+            platform=platform,
+            max_events=min(120, config.max_batch_events),
+            context=context,
         ),
-        NetworkCollector(platform=platform, max_events=min(120, config.max_batch_events)),
         PersistenceCollector(platform=platform, max_events=80),
         ScheduledTaskCollector(platform=platform, max_events=80),
     ]
@@ -53,3 +63,19 @@ def build_collectors(config: AgentConfig) -> list[Collector]:
             )
         )
     return collectors
+
+
+class CollectorSet:
+    """Collectors built once and reused across daemon cycles.
+
+    Only the shared ``CollectionContext`` is reset between cycles, so per-collector setup
+    (compiled patterns, resolved roots, lowered deny lists) is not redone every interval.
+    """
+
+    def __init__(self, config: AgentConfig) -> None:
+        self.context = CollectionContext()
+        self.collectors = build_collectors(config, self.context)
+
+    def begin_cycle(self) -> list[Collector]:
+        self.context.reset()
+        return self.collectors
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import os
 import stat
 try:
@@ -12,7 +13,7 @@ from typing import Any
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
-from shared.constants import MAX_EVENTS_PER_BATCH
+from shared.constants import MAX_EVENTS_PER_BATCH, MAX_PAYLOAD_BYTES
 
 
 class AgentConfig(BaseModel):
@@ -34,6 +35,10 @@ class AgentConfig(BaseModel):
     timeout_seconds: int = Field(default=10, ge=3, le=60)
     max_batch_events: int = Field(default=MAX_EVENTS_PER_BATCH, ge=1, le=MAX_EVENTS_PER_BATCH)
     spool_max_batches: int = Field(default=1000, ge=10, le=10000)
+    # The daemon holds events across cycles until they fill this many bytes or the oldest is
+    # this old; the default age of 0 spools every cycle's events immediately.
+    batch_flush_target_bytes: int = Field(default=MAX_PAYLOAD_BYTES, ge=1024)
+    batch_max_age_seconds: int = Field(default=0, ge=0, le=3600)
     platform: dict[str, Any] = Field(default_factory=lambda: {"failed_login_spike_threshold": 5})
 
     @field_validator("server_url", "org_id", "device_id", "agent_version")
@@ -45,6 +50,7 @@ class AgentConfig(BaseModel):
         return cleaned
 
 
+@functools.lru_cache(maxsize=1)
 def default_agent_dir() -> Path:
     if os.name == "nt":
         appdata = os.getenv("APPDATA")
@@ -93,6 +99,8 @@ def default_config_text(device_id: str) -> str:
         "timeout_seconds = 10\n"
         f"max_batch_events = {MAX_EVENTS_PER_BATCH}\n"
         "spool_max_batches = 1000\n"
+        f"batch_flush_target_bytes = {MAX_PAYLOAD_BYTES}\n"
+        "batch_max_age_seconds = 0\n"
         "platform = { failed_login_spike_threshold = 5 }\n"
     )
 
@@ -1,12 +1,20 @@
 from __future__ import annotations
 
-import json
-import subprocess
 from datetime import UTC, datetime
 
+import orjson
+
+from agent.collectors.common import StreamedCommand
 from shared.enums import Platform, Severity, Source
 from shared.schemas import EventEnvelope
 
+# Titles are fixed per event type; literals keep them interned instead of built per event.
+_TITLES = {
+    "auth_event": "macos_auth_event",
+    "failed_login": "macos_failed_login",
+    "successful_login": "macos_successful_login",
+}
+
 
 class MacOSAuthCollector:
     """Collects best-effort login/authentication signals from macOS unified logs."""
@@ -16,90 +24,102 @@ class MacOSAuthCollector:
         LOG_BIN,
         "show",
         "--style",
-        "json",
+        "ndjson",
         "--last",
         "5m",
         "--predicate",
         '(eventMessage CONTAINS[c] "authentication" OR eventMessage CONTAINS[c] "login")',
     ]
+    TIMEOUT_SECONDS = 5.0
 
     def __init__(self, max_events: int = 50) -> None:
         self.max_events = max_events
 
+    def _unavailable_event(self, reason: str, now: datetime) -> EventEnvelope:
+        return EventEnvelope(
+            ts=now,
+            source=Source.SYSTEM,
+            severity=Severity.WARN,
+            platform=Platform.MACOS,
+            title="macos_auth_collection_unavailable",
+            details_json={"reason": reason},
+        )
+
+    def _parse_line(self, line: bytes, now: datetime) -> EventEnvelope | None:
+        # orjson skips surrounding whitespace itself; blank lines fail to parse and are dropped.
+        try:
+            record = orjson.loads(line)
+        except orjson.JSONDecodeError:
+            return None
+        if not isinstance(record, dict):
+            return None
+
+        message = str(record.get("eventMessage") or "")
+        lowered = message.lower()
+        if "auth" not in lowered and "login" not in lowered:
+            return None
+
+        event_type = "auth_event"
+        severity = Severity.INFO
+        if "fail" in lowered or "invalid" in lowered:
+            event_type = "failed_login"
+            severity = Severity.WARN
+        elif "success" in lowered or "accepted" in lowered:
+            event_type = "successful_login"
+
+        user = str(record.get("userName") or record.get("senderImagePath") or "unknown")
+        return EventEnvelope(
+            ts=now,
+            source=Source.AUTH,
+            severity=severity,
+            platform=Platform.MACOS,
+            title=_TITLES[event_type],
+            details_json={
+                "event_type": event_type,
+                "username": user,
+                "message": message[:512],
+            },
+        )
+
     def collect(self) -> list[EventEnvelope]:
+        now = datetime.now(UTC)
         try:
-            result = subprocess.run(
+            command = StreamedCommand(
                 self.FIXED_ARGS,
-                capture_output=True,
-                text=True,
-                check=False,
-                timeout=5,
+                timeout_seconds=self.TIMEOUT_SECONDS,
+                bufsize=1 << 16,
             )
-        except (FileNotFoundError, PermissionError, subprocess.TimeoutExpired, OSError) as exc:
-            return [
-                EventEnvelope(
-                    ts=datetime.now(UTC),
-                    source=Source.SYSTEM,
-                    severity=Severity.WARN,
-                    platform=Platform.MACOS,
-                    title="macos_auth_collection_unavailable",
-                    details_json={"reason": str(exc.__class__.__name__)},
-                )
-            ]
+        except (FileNotFoundError, PermissionError, OSError) as exc:
+            return [self._unavailable_event(str(exc.__class__.__name__), now)]
+
+        events: list[EventEnvelope] = []
+        stopped_early = False
+        drained = False
+        try:
+            for line in command.stdout:
+                event = self._parse_line(line, now)
+                if event is None:
+                    continue
+                events.append(event)
+                if len(events) >= self.max_events:
+                    stopped_early = True
+                    break
+            else:
+                drained = True
+        finally:
+            return_code = command.close(stop=not drained)
 
-        if result.returncode != 0:
+        if command.timed_out:
+            return [self._unavailable_event("TimeoutExpired", now)]
+        if not stopped_early and return_code != 0:
             return [
                 EventEnvelope(
-                    ts=datetime.now(UTC),
+                    ts=now,
                     source=Source.SYSTEM,
                     severity=Severity.WARN,
                     platform=Platform.MACOS,
                     title="macos_auth_collection_failed",
-                    details_json={"return_code": result.returncode},
+                    details_json={"return_code": return_code},
                 )
             ]
-
-        events: list[EventEnvelope] = []
-        for line in result.stdout.splitlines():
-            if len(events) >= self.max_events:
-                break
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                record = json.loads(line)
-            except json.JSONDecodeError:
-                continue
-            if not isinstance(record, dict):
-                continue
-
-            message = str(record.get("eventMessage") or "")
-            lowered = message.lower()
-            if "auth" not in lowered and "login" not in lowered:
-                continue
-
-            event_type = "auth_event"
-            severity = Severity.INFO
-            if "fail" in lowered or "invalid" in lowered:
-                event_type = "failed_login"
-                severity = Severity.WARN
-            elif "success" in lowered or "accepted" in lowered:
-                event_type = "successful_login"
-
-            user = str(record.get("userName") or record.get("senderImagePath") or "unknown")
-            events.append(
-                EventEnvelope(
-                    ts=datetime.now(UTC),
-                    source=Source.AUTH,
-                    severity=severity,
-                    platform=Platform.MACOS,
-                    title=f"macos_{event_type}",
-                    details_json={
-                        "event_type": event_type,
-                        "username": user,
-                        "message": message[:512],
-                    },
-                )
-            )
-
         return events
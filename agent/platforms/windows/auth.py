@@ -1,24 +1,97 @@
 from __future__ import annotations
 
+import re
 from datetime import UTC, datetime
+from typing import Any
 
 from shared.enums import Platform, Severity, Source
 from shared.schemas import EventEnvelope
 
+_EVENT_ID_RE = re.compile(r"<EventID[^>]*>(\d+)</EventID>")
+_TARGET_USER_RE = re.compile(r"<Data Name=['\"]TargetUserName['\"]>([^<]*)</Data>")
+# Per event id: (severity, event_type, title), all interned literals shared by every event.
+_AUTH_KINDS = {
+    4624: (Severity.INFO, "successful_login", "windows_successful_login"),
+    4625: (Severity.WARN, "failed_login", "windows_failed_login"),
+}
+
 
 class WindowsAuthCollector:
     """Best-effort Windows Event Log auth collector with graceful fallback."""
 
+    AUTH_EVENT_IDS = frozenset({4624, 4625})
+    # Filtered by the event log service so only logon events reach Python.
+    SECURITY_QUERY = "*[System[(EventID=4624 or EventID=4625)]]"
+    EVT_BATCH_SIZE = 32
+    # ReadEventLog cannot filter by event id, so cap how much of the Security log one cycle
+    # scans when logon events are rare.
+    MAX_READ_BUFFERS = 4
+
     def __init__(self, max_events: int = 50) -> None:
         self.max_events = max_events
 
+    def _query_records(self, win32evtlog: Any) -> list[tuple[int, str]]:
+        """Returns (event_id, username) pairs via EvtQuery, newest first."""
+        flags = win32evtlog.EvtQueryChannelPath | win32evtlog.EvtQueryReverseDirection
+        query = win32evtlog.EvtQuery("Security", flags, self.SECURITY_QUERY)
+        records: list[tuple[int, str]] = []
+        while len(records) < self.max_events:
+            handles = win32evtlog.EvtNext(query, self.EVT_BATCH_SIZE)
+            if not handles:
+                break
+            for handle in handles:
+                xml = str(win32evtlog.EvtRender(handle, win32evtlog.EvtRenderEventXml))
+                id_match = _EVENT_ID_RE.search(xml)
+                if id_match is None:
+                    continue
+                event_id = int(id_match.group(1))
+                if event_id not in self.AUTH_EVENT_IDS:
+                    continue
+                user_match = _TARGET_USER_RE.search(xml)
+                username = user_match.group(1) if user_match and user_match.group(1) else "unknown"
+                records.append((event_id, username))
+                if len(records) >= self.max_events:
+                    break
+        return records
+
+    def _read_records(self, win32evtlog: Any) -> list[tuple[int, str]]:
+        """Legacy ReadEventLog path for pywin32 builds without the Evt* API."""
+        flags = win32evtlog.EVENTLOG_BACKWARDS_READ | win32evtlog.EVENTLOG_SEQUENTIAL_READ
+        records: list[tuple[int, str]] = []
+        handle = win32evtlog.OpenEventLog(None, "Security")
+        try:
+            for _ in range(self.MAX_READ_BUFFERS):
+                if len(records) >= self.max_events:
+                    break
+                chunk = win32evtlog.ReadEventLog(handle, flags, 0)
+                if not chunk:
+                    break
+                for event in chunk:
+                    event_id = int(event.EventID & 0xFFFF)
+                    if event_id not in self.AUTH_EVENT_IDS:
+                        continue
+                    inserts = getattr(event, "StringInserts", None) or []
+                    username = "unknown"
+                    if isinstance(inserts, list | tuple) and len(inserts) > 5 and inserts[5]:
+                        username = str(inserts[5])
+                    records.append((event_id, username))
+                    if len(records) >= self.max_events:
+                        break
+        finally:
+            try:
+                win32evtlog.CloseEventLog(handle)
+            except Exception:
+                pass
+        return records
+
     def collect(self) -> list[EventEnvelope]:
+        now = datetime.now(UTC)
         try:
             import win32evtlog  # type: ignore[import-not-found]
         except Exception:
             return [
                 EventEnvelope(
-                    ts=datetime.now(UTC),
+                    ts=now,
                     source=Source.SYSTEM,
                     severity=Severity.WARN,
                     platform=Platform.WINDOWS,
@@ -27,15 +100,15 @@ class WindowsAuthCollector:
                 )
             ]
 
-        flags = win32evtlog.EVENTLOG_BACKWARDS_READ | win32evtlog.EVENTLOG_SEQUENTIAL_READ
-        handle = None
         try:
-            handle = win32evtlog.OpenEventLog(None, "Security")
-            records = win32evtlog.ReadEventLog(handle, flags, 0)
+            if hasattr(win32evtlog, "EvtQuery"):
+                records = self._query_records(win32evtlog)
+            else:
+                records = self._read_records(win32evtlog)
         except Exception as exc:
             return [
                 EventEnvelope(
-                    ts=datetime.now(UTC),
+                    ts=now,
                     source=Source.SYSTEM,
                     severity=Severity.WARN,
                     platform=Platform.WINDOWS,
@@ -43,39 +116,17 @@ class WindowsAuthCollector:
                     details_json={"reason": str(exc.__class__.__name__)},
                 )
             ]
-        finally:
-            if handle is not None:
-                try:
-                    win32evtlog.CloseEventLog(handle)
-                except Exception:
-                    pass
 
         events: list[EventEnvelope] = []
-        for event in records or []:
-            if len(events) >= self.max_events:
-                break
-            event_id = int(event.EventID & 0xFFFF)
-            if event_id not in {4624, 4625}:
-                continue
-            inserts = getattr(event, "StringInserts", None) or []
-            username = "unknown"
-            if isinstance(inserts, list) and len(inserts) > 5 and inserts[5]:
-                username = str(inserts[5])
-
-            if event_id == 4625:
-                severity = Severity.WARN
-                event_type = "failed_login"
-            else:
-                severity = Severity.INFO
-                event_type = "successful_login"
-
+        for event_id, username in records[: self.max_events]:
+            severity, event_type, title = _AUTH_KINDS.get(event_id, _AUTH_KINDS[4624])
             events.append(
                 EventEnvelope(
-                    ts=datetime.now(UTC),
+                    ts=now,
                     source=Source.AUTH,
                     severity=severity,
                     platform=Platform.WINDOWS,
-                    title=f"windows_{event_type}",
+                    title=title,
                     details_json={
                         "event_type": event_type,
                         "event_id": event_id,
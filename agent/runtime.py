@@ -2,11 +2,13 @@ from __future__ import annotations
 
 import logging
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
 
-from agent.collectors.factory import build_collectors, current_platform
+from agent.collectors.factory import CollectorSet, current_platform
 from agent.config import AgentConfig, default_spool_path
 from agent.spool import Spooler
 from agent.sender import Sender
@@ -17,13 +19,19 @@ from shared.serialization import canonical_json_bytes
 
 logger = logging.getLogger("endpoint_agent.runtime")
 
+MAX_COLLECTOR_WORKERS = 8
+
+# The host platform cannot change while the agent runs; resolve it once.
+_PLATFORM = current_platform()
+_PLATFORM_VALUE = _PLATFORM.value
+
 
 def _collector_failure_event(platform: str, collector_name: str, error: Exception) -> EventEnvelope:
     return EventEnvelope(
         ts=datetime.now(UTC),
         source=Source.SYSTEM,
         severity=Severity.WARN,
-        platform=current_platform(),
+        platform=_PLATFORM,
         title="collector_failure",
         details_json={
             "collector": collector_name,
@@ -33,58 +41,73 @@ def _collector_failure_event(platform: str, collector_name: str, error: Exceptio
     )
 
 
-def collect_events(config: AgentConfig) -> list[EventEnvelope]:
+def _is_failed_login(event: EventEnvelope) -> bool:
+    """For an AUTH event, whether it records a failed login."""
+    if "failed" in event.title.lower():
+        return True
+    return str(event.details_json.get("event_type", "")).lower() == "failed_login"
+
+
+def collect_events(
+    config: AgentConfig,
+    collector_set: CollectorSet | None = None,
+) -> list[EventEnvelope]:
     events: list[EventEnvelope] = []
-    platform_name = current_platform().value
-    collectors = build_collectors(config)
-    for collector in collectors:
-        try:
-            collected = collector.collect()
+    collectors = (collector_set or CollectorSet(config)).begin_cycle()
+    if not collectors:
+        return events
+    auth_events: list[EventEnvelope] = []
+    # Collectors are dominated by subprocess, filesystem and OS API waits, so they overlap well
+    # in threads; results are still merged in collector order.
+    with ThreadPoolExecutor(max_workers=min(MAX_COLLECTOR_WORKERS, len(collectors))) as pool:
+        futures = [pool.submit(collector.collect) for collector in collectors]
+        for collector, future in zip(collectors, futures, strict=True):
+            try:
+                collected = future.result()
+            except Exception as exc:
+                logger.exception("collector failed: %s", collector.__class__.__name__, exc_info=exc)
+                name = collector.__class__.__name__
+                events.append(_collector_failure_event(_PLATFORM_VALUE, name, exc))
+                continue
+            # AUTH events are bucketed while merging so spike detection only looks at those.
+            # Enum members are singletons, so identity is the cheapest exact comparison.
+            for event in collected:
+                if event.source is Source.AUTH:
+                    auth_events.append(event)
             events.extend(collected)
-        except Exception as exc:
-            logger.exception("collector failed: %s", collector.__class__.__name__)
-            events.append(_collector_failure_event(platform_name, collector.__class__.__name__, exc))
-    events.extend(_failed_login_spike_events(events, config))
+    failed = sum(1 for event in auth_events if _is_failed_login(event))
+    spike = _failed_login_spike_event(failed, config)
+    if spike is not None:
+        events.append(spike)
     return events
 
 
-def _failed_login_spike_events(events: list[EventEnvelope], config: AgentConfig) -> list[EventEnvelope]:
+def _failed_login_spike_event(failed: int, config: AgentConfig) -> EventEnvelope | None:
     threshold_raw = config.platform.get("failed_login_spike_threshold", 5)
     try:
         threshold = max(1, int(threshold_raw))
     except (TypeError, ValueError):
         threshold = 5
 
-    failed = 0
-    for event in events:
-        if event.source != Source.AUTH:
-            continue
-        lowered_title = event.title.lower()
-        event_type = str(event.details_json.get("event_type", "")).lower()
-        if "failed" in lowered_title or event_type == "failed_login":
-            failed += 1
-
     if failed < threshold:
-        return []
+        return None
 
     rate_per_minute = round(failed / max(1, config.interval_seconds / 60.0), 2)
     severity = Severity.HIGH if failed >= threshold * 2 else Severity.WARN
-    return [
-        EventEnvelope(
-            ts=datetime.now(UTC),
-            source=Source.AUTH,
-            severity=severity,
-            platform=current_platform(),
-            title="failed_login_spike",
-            details_json={
-                "event_type": "failed_login_spike",
-                "failed_count": failed,
-                "threshold": threshold,
-                "window_seconds": config.interval_seconds,
-                "rate_per_minute": rate_per_minute,
-            },
-        )
-    ]
+    return EventEnvelope(
+        ts=datetime.now(UTC),
+        source=Source.AUTH,
+        severity=severity,
+        platform=_PLATFORM,
+        title="failed_login_spike",
+        details_json={
+            "event_type": "failed_login_spike",
+            "failed_count": failed,
+            "threshold": threshold,
+            "window_seconds": config.interval_seconds,
+            "rate_per_minute": rate_per_minute,
+        },
+    )
 
 
 def _request_size_for(events: list[EventEnvelope], config: AgentConfig) -> int:
@@ -99,56 +122,142 @@ def _request_size_for(events: list[EventEnvelope], config: AgentConfig) -> int:
     return len(canonical_json_bytes(req))
 
 
-def split_batches(events: list[EventEnvelope], config: AgentConfig) -> list[list[EventEnvelope]]:
+def _event_size(event: EventEnvelope) -> int:
+    return len(canonical_json_bytes(event))
+
+
+def split_batches(
+    events: list[EventEnvelope],
+    config: AgentConfig,
+    sizes: list[int] | None = None,
+) -> list[list[EventEnvelope]]:
     if not events:
         return []
 
     max_events = min(config.max_batch_events, MAX_EVENTS_PER_BATCH)
+    if sizes is None:
+        sizes = [_event_size(event) for event in events]
+    # Canonical JSON nests each event verbatim, so a request is its fixed envelope bytes plus
+    # the event sizes plus one comma between events; serialize once instead of per candidate.
+    overhead = _request_size_for(events[:1], config) - sizes[0]
     batches: list[list[EventEnvelope]] = []
     current: list[EventEnvelope] = []
+    current_bytes = overhead
 
-    for event in events:
-        candidate = current + [event]
-        candidate_size = _request_size_for(candidate, config)
-        if current and (len(candidate) > max_events or candidate_size > MAX_PAYLOAD_BYTES):
+    for event, size in zip(events, sizes, strict=True):
+        added = size + 1 if current else size
+        if current and (len(current) + 1 > max_events or current_bytes + added > MAX_PAYLOAD_BYTES):
             batches.append(current)
             current = [event]
+            current_bytes = overhead + size
         else:
-            current = candidate
+            current.append(event)
+            current_bytes += added
 
     if current:
         batches.append(current)
     return batches
 
 
+class PendingEvents:
+    """Events the daemon holds in memory across cycles until a flush is due."""
+
+    def __init__(self) -> None:
+        self.events: list[EventEnvelope] = []
+        self.sizes: list[int] = []
+        self.size_bytes = 0
+        self.oldest_at: float | None = None
+
+    def add(self, events: list[EventEnvelope]) -> None:
+        if not events:
+            return
+        if self.oldest_at is None:
+            self.oldest_at = time.monotonic()
+        sizes = [_event_size(event) for event in events]
+        self.events.extend(events)
+        self.sizes.extend(sizes)
+        self.size_bytes += sum(sizes)
+
+    def flush_reason(self, config: AgentConfig) -> str | None:
+        if not self.events or self.oldest_at is None:
+            return None
+        if self.size_bytes >= config.batch_flush_target_bytes:
+            return "size"
+        if time.monotonic() - self.oldest_at >= config.batch_max_age_seconds:
+            return "age"
+        return None
+
+    def drain(self) -> tuple[list[EventEnvelope], list[int]]:
+        events, sizes = self.events, self.sizes
+        self.events, self.sizes, self.size_bytes, self.oldest_at = [], [], 0, None
+        return events, sizes
+
+
+def _spool_pending(config: AgentConfig, spooler: Spooler, pending: PendingEvents) -> int:
+    events, sizes = pending.drain()
+    batches = split_batches(events, config, sizes)
+    spooler.enqueue_many(batches)
+    return len(batches)
+
+
+def run_cycle(
+    config: AgentConfig,
+    spooler: Spooler,
+    sender: Sender,
+    collector_set: CollectorSet | None = None,
+    pending: PendingEvents | None = None,
+) -> dict[str, Any]:
+    events = collect_events(config, collector_set)
+    # Without a daemon-held buffer (run-once) every cycle's events are spooled immediately.
+    buffer = pending if pending is not None else PendingEvents()
+    buffer.add(events)
+    flush_reason = buffer.flush_reason(config) if pending is not None else "cycle"
+    queued = 0
+    if flush_reason is not None:
+        queued = _spool_pending(config, spooler, buffer)
+    dropped = spooler.enforce_limit()
+    sent, failed = sender.send_due(spooler)
+    return {
+        "collected_events": len(events),
+        "queued_batches": queued,
+        "flush_reason": flush_reason,
+        "pending_events": len(buffer.events),
+        "sent_batches": sent,
+        "failed_batches": failed,
+        "dropped_batches": dropped,
+        "spool_depth": spooler.count(),
+    }
+
+
 def run_once(config: AgentConfig, spool_path: Path | None = None) -> dict[str, Any]:
     spooler = Spooler(spool_path or default_spool_path(), max_batches=config.spool_max_batches)
     sender = Sender(config)
     try:
-        events = collect_events(config)
-        batches = split_batches(events, config)
-        dropped = 0
-        for batch in batches:
-            spooler.enqueue(batch)
-        dropped += spooler.enforce_limit()
-        sent, failed = sender.send_due(spooler)
-        return {
-            "collected_events": len(events),
-            "queued_batches": len(batches),
-            "sent_batches": sent,
-            "failed_batches": failed,
-            "dropped_batches": dropped,
-            "spool_depth": spooler.count(),
-        }
+        return run_cycle(config, spooler, sender)
     finally:
+        sender.close()
         spooler.close()
 
 
 def run_daemon(config: AgentConfig, stop_event: threading.Event, spool_path: Path | None = None) -> None:
-    while not stop_event.is_set():
+    # Spool connection, HTTP client and collectors live for the whole daemon, not per cycle.
+    spooler = Spooler(spool_path or default_spool_path(), max_batches=config.spool_max_batches)
+    sender = Sender(config)
+    collector_set = CollectorSet(config)
+    pending = PendingEvents()
+    try:
+        while not stop_event.is_set():
+            try:
+                summary = run_cycle(config, spooler, sender, collector_set, pending)
+                logger.info("cycle summary=%s", summary)
+            except Exception:
+                logger.exception("daemon cycle failed")
+            stop_event.wait(timeout=config.interval_seconds)
+    finally:
         try:
-            summary = run_once(config, spool_path=spool_path)
-            logger.info("cycle summary=%s", summary)
-        except Exception:
-            logger.exception("daemon cycle failed")
-        stop_event.wait(timeout=config.interval_seconds)
+            # Spool whatever is still held so a shutdown does not lose buffered events.
+            if pending.events:
+                _spool_pending(config, spooler, pending)
+        finally:
+            sender.close()
+            spooler.close()
@@ -3,6 +3,7 @@ from __future__ import annotations
 import logging
 import secrets
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime
 
 import httpx
@@ -10,34 +11,50 @@ import httpx
 from agent.config import AgentConfig
 from agent.spool import SpoolBatch, Spooler
 from shared.constants import MAX_PAYLOAD_BYTES
-from shared.schemas import IngestRequest, IngestResponse
-from shared.serialization import canonical_json_bytes
-from shared.signing import build_signed_headers
+from shared.schemas import IngestResponse
+from shared.serialization import canonical_envelope_parts
+from shared.signing import build_signed_headers_from_chunks
 
 logger = logging.getLogger("endpoint_agent.sender")
 
+# Batches posted in parallel per send_due call; the connection pool keeps this many alive.
+SEND_CONCURRENCY = 4
+
 
 class Sender:
     def __init__(self, config: AgentConfig) -> None:
         self.config = config
         self.ingest_url = config.server_url.rstrip("/") + "/ingest"
+        # One pooled client per Sender so consecutive batches and cycles reuse the TLS session.
+        self._client = httpx.Client(
+            timeout=config.timeout_seconds,
+            verify=config.tls_verify,
+            limits=httpx.Limits(max_keepalive_connections=SEND_CONCURRENCY, keepalive_expiry=60),
+        )
 
-    def _build_payload(self, batch: SpoolBatch) -> tuple[bytes, dict[str, str]]:
+    def close(self) -> None:
+        self._client.close()
+
+    def _build_payload_chunks(self, batch: SpoolBatch) -> tuple[tuple[bytes, ...], dict[str, str]]:
+        """The canonical request body as (prefix, spooled events, suffix) plus signed headers."""
         nonce = secrets.token_hex(16)
         sent_at = datetime.now(UTC)
-        req = IngestRequest(
-            org_id=self.config.org_id,
-            device_id=self.config.device_id,
-            agent_version=self.config.agent_version,
-            sent_at=sent_at,
-            nonce=nonce,
-            events=batch.events,
-        )
-        body = canonical_json_bytes(req)
-        if len(body) > MAX_PAYLOAD_BYTES:
+        envelope = {
+            "org_id": self.config.org_id,
+            "device_id": self.config.device_id,
+            "agent_version": self.config.agent_version,
+            "sent_at": sent_at.isoformat().replace("+00:00", "Z"),
+            "nonce": nonce,
+        }
+        # Spooled events are already canonical JSON; they go out between the envelope's prefix
+        # and suffix as-is, so the body is neither re-validated nor copied into one buffer.
+        prefix, suffix = canonical_envelope_parts(envelope)
+        chunks = (prefix, batch.events_blob, suffix)
+        body_length = len(prefix) + len(batch.events_blob) + len(suffix)
+        if body_length > MAX_PAYLOAD_BYTES:
             raise ValueError("payload exceeds max payload bytes")
-        headers = build_signed_headers(
-            body=req,
+        headers = build_signed_headers_from_chunks(
+            chunks,
             api_key=str(self.config.api_key),
             org_id=self.config.org_id,
             device_id=self.config.device_id,
@@ -45,7 +62,33 @@ class Sender:
             nonce=nonce,
         )
         headers["Content-Type"] = "application/json"
-        return body, headers
+        # An explicit length keeps httpx from switching the iterator body to chunked encoding.
+        headers["Content-Length"] = str(body_length)
+        return chunks, headers
+
+    def _build_payload(self, batch: SpoolBatch) -> tuple[bytes, dict[str, str]]:
+        chunks, headers = self._build_payload_chunks(batch)
+        return b"".join(chunks), headers
+
+    def _deliver(self, batch: SpoolBatch) -> bool | None:
+        """Posts one batch: True if accepted, False if it should be retried, None if malformed."""
+        try:
+            chunks, headers = self._build_payload_chunks(batch)
+        except Exception as exc:
+            logger.warning("dropping malformed spool batch_id=%s reason=%s", batch.batch_id, exc)
+            return None
+        try:
+            response = self._client.post(self.ingest_url, content=iter(chunks), headers=headers)
+        except httpx.HTTPError:
+            return False
+
+        if response.status_code != 200:
+            return False
+        try:
+            IngestResponse.model_validate(response.json())
+        except Exception:
+            return False
+        return True
 
     def send_due(self, spooler: Spooler, limit: int = 20) -> tuple[int, int]:
         accepted = 0
@@ -57,32 +100,22 @@ class Sender:
         if not self.config.tls_verify:
             logger.warning("tls_verify is disabled; this must not be used in production")
 
-        with httpx.Client(timeout=self.config.timeout_seconds, verify=self.config.tls_verify) as client:
-            for batch in batches:
-                if not batch.events:
-                    spooler.mark_sent(batch.batch_id)
-                    continue
-                try:
-                    body, headers = self._build_payload(batch)
-                except Exception as exc:
-                    logger.warning("dropping malformed spool batch_id=%s reason=%s", batch.batch_id, exc)
+        to_send: list[SpoolBatch] = []
+        for batch in batches:
+            if batch.event_count == 0:
+                spooler.mark_sent(batch.batch_id)
+            else:
+                to_send.append(batch)
+        if not to_send:
+            return 0, 0
+
+        # Posts overlap on the shared client's pool; spool updates stay on this thread.
+        with ThreadPoolExecutor(max_workers=min(SEND_CONCURRENCY, len(to_send))) as pool:
+            for batch, outcome in zip(to_send, pool.map(self._deliver, to_send), strict=True):
+                if outcome is None:
                     spooler.mark_sent(batch.batch_id)
                     failed += 1
-                    continue
-                try:
-                    response = client.post(self.ingest_url, content=body, headers=headers)
-                except httpx.HTTPError:
-                    spooler.mark_failed(batch.batch_id, batch.retry_count + 1)
-                    failed += 1
-                    continue
-
-                if response.status_code == 200:
-                    try:
-                        IngestResponse.model_validate(response.json())
-                    except Exception:
-                        spooler.mark_failed(batch.batch_id, batch.retry_count + 1)
-                        failed += 1
-                        continue
+                elif outcome:
                     spooler.mark_sent(batch.batch_id)
                     accepted += 1
                 else:
@@ -7,37 +7,64 @@ from typing import Any
 
 from core.models import Insight
 
-STABLE_EVIDENCE_KEYS = (
-    "process_name",
-    "exe",
-    "pid",
-    "ip",
-    "port",
-    "username",
-    "event_type",
-    "listener",
-    "metric",
-    "classification",
-    "change",
+STABLE_EVIDENCE_KEYS = frozenset(
+    {
+        "process_name",
+        "exe",
+        "pid",
+        "ip",
+        "port",
+        "username",
+        "event_type",
+        "listener",
+        "metric",
+        "classification",
+        "change",
+    }
 )
 
+# Fields are joined with the ASCII unit separator: str.split() treats it as whitespace, so
+# it never survives title normalisation, and repr() escapes it inside string values.
+_FIELD_SEPARATOR = b"\x1f"
+# 128-bit keyed digests are ample for dedup. The keyed state is set up once and copied per
+# call, which is cheaper than constructing a keyed hasher each time.
+_FINGERPRINT_KEY = b"sec44-fp-v1"
+_FINGERPRINT_HASHER = hashlib.blake2b(digest_size=16, key=_FINGERPRINT_KEY)
 
-def build_fingerprint(source: str, title: str, evidence: dict[str, Any]) -> str:
-    stable: dict[str, Any] = {}
-    for key in STABLE_EVIDENCE_KEYS:
-        if key in evidence:
-            stable[key] = evidence[key]
-    if not stable:
-        for key, value in sorted(evidence.items()):
-            if isinstance(value, (str, int, float, bool)) or value is None:
-                stable[key] = value
-    payload = {
-        "source": source.lower(),
-        "title": " ".join(title.lower().split()),
-        "stable": stable,
-    }
-    raw = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=True)
-    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+def _stable_value(value: Any) -> str:
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=True)
+    return repr(value)
+
+
+def build_fingerprint(
+    source: str,
+    title: str,
+    evidence: dict[str, Any],
+    *,
+    already_stable: bool = False,
+) -> str:
+    """``already_stable`` hashes ``evidence`` as-is; callers pass it only for scalar-only
+    evidence with no stable keys, where selection would keep every item anyway."""
+    if already_stable:
+        stable = evidence
+    elif stable_keys := STABLE_EVIDENCE_KEYS.intersection(evidence):
+        stable = {key: evidence[key] for key in stable_keys}
+    else:
+        stable = {
+            key: value
+            for key, value in evidence.items()
+            if isinstance(value, (str, int, float, bool)) or value is None
+        }
+    fields = [source.lower().encode("utf-8"), " ".join(title.lower().split()).encode("utf-8")]
+    fields.extend(
+        f"{key}={_stable_value(stable[key])}".encode("utf-8", "backslashreplace")
+        for key in sorted(stable)
+    )
+    hasher = _FINGERPRINT_HASHER.copy()
+    hasher.update(_FIELD_SEPARATOR.join(fields))
+    return hasher.hexdigest()
 
 
 def suppress_repeated(
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
-from collections import defaultdict
+import functools
+import heapq
+import re
+import sys
+from collections import Counter, defaultdict
 from datetime import UTC, date, datetime, timedelta
-from statistics import mean
 from typing import Any
 
 from core.baseline import METRIC_KEYS, compute_baseline
@@ -10,116 +13,156 @@ from core.dedup import build_fingerprint
 from core.models import DailyBrief, DriverShare, Insight, InsightBundle
 from shared.enums import Severity, Source
 
+# Enum values resolved once; the helpers below compare raw event dict fields against them.
+# Interned so dict keys built from them (weights, counts, categories) share one object each.
+_SRC_AUTH = sys.intern(Source.AUTH.value)
+_SRC_PROCESS = sys.intern(Source.PROCESS.value)
+_SRC_SYSTEM = sys.intern(Source.SYSTEM.value)
+_SEV_INFO = sys.intern(Severity.INFO.value)
+_SEV_WARN = sys.intern(Severity.WARN.value)
+_SEV_HIGH = sys.intern(Severity.HIGH.value)
+
+_CATEGORY_LOOKUP = {
+    sys.intern(Source.NETWORK.value): "network_exposure",
+    _SRC_PROCESS: "process",
+    _SRC_AUTH: "auth",
+    sys.intern(Source.FILEWATCH.value): "filewatch",
+}
+_METRIC_SOURCES = {
+    "failed_logins": Source.AUTH,
+    "new_listeners": Source.NETWORK,
+    "new_processes": Source.PROCESS,
+    "suspicious_execs": Source.PROCESS,
+}
+
 
 def _safe_ts(value: Any) -> datetime:
     if isinstance(value, datetime):
         return value.astimezone(UTC) if value.tzinfo else value.replace(tzinfo=UTC)
-    parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    return _parse_ts(str(value))
+
+
+@functools.lru_cache(maxsize=8192)
+def _parse_ts(text: str) -> datetime:
+    # Stored events often share timestamp strings, so each distinct one is parsed once.
+    parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
     return parsed.astimezone(UTC) if parsed.tzinfo else parsed.replace(tzinfo=UTC)
 
 
 def _category_for_source(source: str) -> str:
-    lookup = {
-        Source.NETWORK.value: "network_exposure",
-        Source.PROCESS.value: "process",
-        Source.AUTH.value: "auth",
-        Source.FILEWATCH.value: "filewatch",
-    }
-    return lookup.get(source, "process")
-
-
-def _listener_key(event: dict[str, Any]) -> str | None:
-    details = event.get("details_json") or {}
-    if not isinstance(details, dict):
-        return None
-    ip = str(details.get("ip") or details.get("laddr_ip") or "")
-    port = details.get("port") or details.get("laddr_port")
-    if port is None:
-        return None
-    return f"{ip}:{port}"
-
-
-def _process_key(event: dict[str, Any]) -> str | None:
-    details = event.get("details_json") or {}
-    if not isinstance(details, dict):
-        return None
-    name = str(details.get("process_name") or details.get("name") or "")
-    exe = str(details.get("exe") or "")
-    if not name and not exe:
-        return None
-    return f"{name}|{exe}"
-
-
-def _is_failed_login(event: dict[str, Any]) -> bool:
-    source = str(event.get("source") or "")
-    if source != Source.AUTH.value:
-        return False
-    title = str(event.get("title") or "").lower()
-    if "failed" in title:
-        return True
-    details = event.get("details_json") or {}
-    if isinstance(details, dict) and str(details.get("event_type") or "").lower() == "failed_login":
-        return True
-    severity = str(event.get("severity") or "")
-    return severity in {Severity.WARN.value, Severity.HIGH.value}
-
-
-def _is_suspicious_exec(event: dict[str, Any]) -> bool:
-    if str(event.get("source") or "") != Source.PROCESS.value:
-        return False
-    details = event.get("details_json") or {}
-    if not isinstance(details, dict):
-        return False
-    exe = str(details.get("exe") or "").lower()
-    markers = ["/tmp/", "/private/tmp/", "\\appdata\\local\\temp\\", "\\temp\\"]
-    return any(marker in exe for marker in markers)
-
-
-def _event_fingerprint(event: dict[str, Any]) -> str:
-    source = str(event.get("source") or Source.SYSTEM.value)
-    title = str(event.get("title") or "event")
-    details = event.get("details_json") if isinstance(event.get("details_json"), dict) else {}
-    return build_fingerprint(source, title, details)
-
-
-def _daily_sets(events: list[dict[str, Any]]) -> tuple[set[str], set[str]]:
+    return _CATEGORY_LOOKUP.get(source, "process")
+
+
+# One case-insensitive scan for all temp-dir markers, instead of lower() plus a scan per marker.
+_SUSPICIOUS_EXEC_RE = re.compile(
+    r"/tmp/|/private/tmp/|\\appdata\\local\\temp\\|\\temp\\",  # noqa: S108 - matched, never written
+    re.IGNORECASE,
+)
+_ELEVATED_SEVERITIES = frozenset({_SEV_WARN, _SEV_HIGH})
+
+# (failed_logins, listener keys, process keys, suspicious_execs, WARN/HIGH events) for one day.
+_DayScan = tuple[int, set[str], set[str], int, list[dict[str, Any]]]
+
+
+def _scan_day(events: list[dict[str, Any]]) -> _DayScan:
+    """Classifies a day's events in one pass."""
+    suspicious_exec = _SUSPICIOUS_EXEC_RE.search
+    failed_logins = 0
+    suspicious_execs = 0
     listeners: set[str] = set()
     processes: set[str] = set()
+    elevated_events: list[dict[str, Any]] = []
     for event in events:
-        listener = _listener_key(event)
-        process = _process_key(event)
-        if listener:
-            listeners.add(listener)
-        if process:
-            processes.add(process)
-    return listeners, processes
+        elevated = str(event.get("severity")) in _ELEVATED_SEVERITIES
+        if elevated:
+            elevated_events.append(event)
+        details = event.get("details_json") or {}
+        if not isinstance(details, dict):
+            details = None
+        exe = ""
+        if details is not None:
+            port = details.get("port") or details.get("laddr_port")
+            if port is not None:
+                listeners.add(f"{details.get('ip') or details.get('laddr_ip') or ''}:{port}")
+            name = str(details.get("process_name") or details.get("name") or "")
+            exe = str(details.get("exe") or "")
+            if name or exe:
+                processes.add(f"{name}|{exe}")
+
+        source = str(event.get("source") or "")
+        if source == _SRC_AUTH:
+            if (
+                "failed" in str(event.get("title") or "").lower()
+                or (
+                    details is not None
+                    and str(details.get("event_type") or "").lower() == "failed_login"
+                )
+                or elevated
+            ):
+                failed_logins += 1
+        elif source == _SRC_PROCESS and details is not None and suspicious_exec(exe):
+            suspicious_execs += 1
+    return failed_logins, listeners, processes, suspicious_execs, elevated_events
+
+
+def _change_fingerprints(elevated_events: list[dict[str, Any]]) -> dict[str, str]:
+    """Fingerprint -> title for a day's WARN/HIGH events, hashing each distinct event once."""
+    output: dict[str, str] = {}
+    seen: dict[tuple[str, str, str], str] = {}
+    for event in elevated_events:
+        source = str(event.get("source") or _SRC_SYSTEM)
+        title = str(event.get("title") or "event")
+        details = event.get("details_json") if isinstance(event.get("details_json"), dict) else {}
+        # Repeated identical events (e.g. the same failed login) share one hash computation.
+        key = (source, title, repr(details))
+        fingerprint = seen.get(key)
+        if fingerprint is None:
+            fingerprint = seen[key] = build_fingerprint(source, title, details)
+        output[fingerprint] = str(event.get("title") or "")
+    return output
+
+
+def _cached_scan(
+    grouped: dict[date, list[dict[str, Any]]],
+    scans: dict[date, _DayScan],
+    day: date,
+) -> _DayScan:
+    scan = scans.get(day)
+    if scan is None:
+        scan = scans[day] = _scan_day(grouped.get(day, []))
+    return scan
 
 
 def _compute_day_metrics(
     grouped: dict[date, list[dict[str, Any]]],
     target_day: date,
+    scans: dict[date, _DayScan],
 ) -> dict[str, int]:
-    today_events = grouped.get(target_day, [])
-    prev_day = target_day - timedelta(days=1)
-    prev_events = grouped.get(prev_day, [])
-    today_listeners, today_processes = _daily_sets(today_events)
-    prev_listeners, prev_processes = _daily_sets(prev_events)
+    # Each day is also the previous day of the next one, so scans are shared through ``scans``.
+    failed_logins, today_listeners, today_processes, suspicious_execs, _ = _cached_scan(
+        grouped, scans, target_day
+    )
+    prev_scan = _cached_scan(grouped, scans, target_day - timedelta(days=1))
+    prev_listeners, prev_processes = prev_scan[1], prev_scan[2]
 
     return {
-        "failed_logins": sum(1 for event in today_events if _is_failed_login(event)),
+        "failed_logins": failed_logins,
         "new_listeners": len(today_listeners - prev_listeners),
         "new_processes": len(today_processes - prev_processes),
-        "suspicious_execs": sum(1 for event in today_events if _is_suspicious_exec(event)),
+        "suspicious_execs": suspicious_execs,
     }
 
 
-def _driver_shares(events: list[dict[str, Any]], severity_weights: dict[str, int]) -> list[DriverShare]:
+def _event_scores(events: list[dict[str, Any]], severity_weights: dict[str, int]) -> list[int]:
+    return [severity_weights.get(str(event.get("severity") or _SEV_INFO), 0) for event in events]
+
+
+def _driver_shares(events: list[dict[str, Any]], scores: list[int]) -> list[DriverShare]:
+    """Weighted share per category; ``scores`` are the events' severity weights, in order."""
     raw_scores: dict[str, float] = defaultdict(float)
-    for event in events:
-        source = str(event.get("source") or Source.SYSTEM.value)
-        severity = str(event.get("severity") or Severity.INFO.value)
-        category = _category_for_source(source)
-        raw_scores[category] += float(severity_weights.get(severity, 0))
+    for event, weight in zip(events, scores, strict=True):
+        category = _category_for_source(str(event.get("source") or _SRC_SYSTEM))
+        raw_scores[category] += float(weight)
 
     total = sum(raw_scores.values())
     if total <= 0:
@@ -168,9 +211,9 @@ def build_insight_bundle(
 
     current = now or datetime.now(UTC)
     weights = severity_weights or {
-        Severity.INFO.value: 1,
-        Severity.WARN.value: 3,
-        Severity.HIGH.value: 8,
+        _SEV_INFO: 1,
+        _SEV_WARN: 3,
+        _SEV_HIGH: 8,
     }
 
     grouped: dict[date, list[dict[str, Any]]] = defaultdict(list)
@@ -181,43 +224,40 @@ def build_insight_bundle(
     target_day = max(grouped.keys())
     target_events = grouped[target_day]
 
-    history_days = sorted(day for day in grouped if day < target_day)
-    prior_14 = history_days[-14:]
-    prior_30 = history_days[-30:]
+    # Only the latest 30 history days are used; select them without sorting the whole history.
+    prior_30 = heapq.nlargest(30, (day for day in grouped if day < target_day))
+    prior_30.reverse()
+    prior_14 = prior_30[-14:]
 
-    today_metrics = _compute_day_metrics(grouped, target_day)
-    prior_metrics = [_compute_day_metrics(grouped, day) for day in prior_14]
+    scans: dict[date, _DayScan] = {}
+    today_metrics = _compute_day_metrics(grouped, target_day, scans)
+    prior_metrics = [_compute_day_metrics(grouped, day, scans) for day in prior_14]
     baseline = compute_baseline(today_metrics, prior_metrics)
 
-    raw_today = sum(weights.get(str(event.get("severity") or Severity.INFO.value), 0) for event in target_events)
-    raw_30 = [
-        sum(weights.get(str(event.get("severity") or Severity.INFO.value), 0) for event in grouped[day])
-        for day in prior_30
-    ]
+    # Severity weights are read once per event; the 30-day and 7-day windows share day totals.
+    target_scores = _event_scores(target_events, weights)
+    raw_today = sum(target_scores)
+    day_scores = {day: sum(_event_scores(grouped[day], weights)) for day in prior_30}
+    raw_30 = [day_scores[day] for day in prior_30]
     rolling_max = max(raw_30 + [raw_today]) if (raw_30 or raw_today > 0) else 30
     normalized_denominator = max(rolling_max, 30)
     risk_score = int(min(100, round((raw_today / normalized_denominator) * 100)))
 
+    # Unlike the scores above, events without a severity are not counted as INFO here.
+    severity_counts = Counter(str(event.get("severity")) for event in target_events)
     counts = {
-        Severity.INFO.value: sum(1 for event in target_events if str(event.get("severity")) == Severity.INFO.value),
-        Severity.WARN.value: sum(1 for event in target_events if str(event.get("severity")) == Severity.WARN.value),
-        Severity.HIGH.value: sum(1 for event in target_events if str(event.get("severity")) == Severity.HIGH.value),
+        _SEV_INFO: severity_counts[_SEV_INFO],
+        _SEV_WARN: severity_counts[_SEV_WARN],
+        _SEV_HIGH: severity_counts[_SEV_HIGH],
     }
 
-    drivers = _driver_shares(target_events, weights)
+    drivers = _driver_shares(target_events, target_scores)
 
+    # The day scans already picked out WARN/HIGH events (yesterday was scanned as the target's
+    # previous day), so only those are fingerprinted here.
     yesterday = target_day - timedelta(days=1)
-    y_events = grouped.get(yesterday, [])
-    today_fp = {
-        _event_fingerprint(event): str(event.get("title") or "")
-        for event in target_events
-        if str(event.get("severity")) in {Severity.WARN.value, Severity.HIGH.value}
-    }
-    y_fp = {
-        _event_fingerprint(event): str(event.get("title") or "")
-        for event in y_events
-        if str(event.get("severity")) in {Severity.WARN.value, Severity.HIGH.value}
-    }
+    today_fp = _change_fingerprints(_cached_scan(grouped, scans, target_day)[4])
+    y_fp = _change_fingerprints(_cached_scan(grouped, scans, yesterday)[4])
 
     new_changes = sorted(today_fp[fp] for fp in set(today_fp) - set(y_fp))
     resolved_changes = sorted(y_fp[fp] for fp in set(y_fp) - set(today_fp))
@@ -227,28 +267,30 @@ def build_insight_bundle(
         metric = baseline[metric_key]
         if metric.classification.value == "normal":
             continue
-        source_map = {
-            "failed_logins": Source.AUTH,
-            "new_listeners": Source.NETWORK,
-            "new_processes": Source.PROCESS,
-            "suspicious_execs": Source.PROCESS,
-        }
+        source = _METRIC_SOURCES.get(metric_key, Source.SYSTEM)
         severity = Severity.HIGH if metric.classification.value == "anomalous" else Severity.WARN
         title = f"{metric.metric} is {metric.ratio:.1f}x above 14-day median"
-        evidence = metric.model_dump(mode="json")
+        # Same dict as metric.model_dump(mode="json"), without pydantic's serializer per insight.
+        evidence = {
+            "metric": metric.metric,
+            "today": metric.today,
+            "baseline": metric.baseline,
+            "ratio": metric.ratio,
+            "classification": metric.classification.value,
+        }
         insights.append(
             Insight(
                 ts=current,
                 day=target_day,
                 insight_type="anomaly",
-                source=source_map.get(metric_key, Source.SYSTEM),
+                source=source,
                 severity=severity,
                 title=title,
                 explanation=(
                     "Anomaly rule: normal <1.5x, elevated 1.5x-2.9x, anomalous >=3x versus 14-day median."
                 ),
                 evidence=evidence,
-                fingerprint=build_fingerprint(source_map.get(metric_key, Source.SYSTEM).value, title, evidence),
+                fingerprint=build_fingerprint(source.value, title, evidence),
             )
         )
 
@@ -257,7 +299,7 @@ def build_insight_bundle(
             continue
         severity = Severity.WARN if driver.percent >= 40 else Severity.INFO
         title = f"Risk driver: {driver.category} ({driver.percent:.1f}%)"
-        evidence = driver.model_dump(mode="json")
+        evidence = {"category": driver.category, "score": driver.score, "percent": driver.percent}
         insights.append(
             Insight(
                 ts=current,
@@ -268,7 +310,8 @@ def build_insight_bundle(
                 title=title,
                 explanation="Driver share is weighted category score divided by total weighted score for the day.",
                 evidence=evidence,
-                fingerprint=build_fingerprint(Source.SYSTEM.value, title, evidence),
+                # Driver evidence is scalar-only with no stable keys, so selection is a no-op.
+                fingerprint=build_fingerprint(_SRC_SYSTEM, title, evidence, already_stable=True),
             )
         )
 
@@ -285,7 +328,7 @@ def build_insight_bundle(
                 title=title,
                 explanation="Change was observed in today's WARN/HIGH set but not in yesterday's.",
                 evidence=evidence,
-                fingerprint=build_fingerprint(Source.SYSTEM.value, title, evidence),
+                fingerprint=build_fingerprint(_SRC_SYSTEM, title, evidence),
             )
         )
 
@@ -302,27 +345,16 @@ def build_insight_bundle(
                 title=title,
                 explanation="Change was present yesterday but not found in today's WARN/HIGH set.",
                 evidence=evidence,
-                fingerprint=build_fingerprint(Source.SYSTEM.value, title, evidence),
+                fingerprint=build_fingerprint(_SRC_SYSTEM, title, evidence),
                 status="resolved",
             )
         )
 
     recent_scores = [
-        int(
-            min(
-                100,
-                round(
-                    (
-                        sum(weights.get(str(event.get("severity") or Severity.INFO.value), 0) for event in grouped[day])
-                        / normalized_denominator
-                    )
-                    * 100
-                ),
-            )
-        )
-        for day in history_days[-7:]
+        int(min(100, round((day_scores[day] / normalized_denominator) * 100)))
+        for day in prior_30[-7:]
     ]
-    avg_7d = mean(recent_scores) if recent_scores else float(risk_score)
+    avg_7d = sum(recent_scores) / len(recent_scores) if recent_scores else float(risk_score)
     delta_vs_7d = round(risk_score - avg_7d, 2)
     top_driver = drivers[0].category if drivers else "none"
 
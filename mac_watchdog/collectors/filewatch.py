@@ -3,7 +3,7 @@ from __future__ import annotations
 import os
 import threading
 import time
-from collections import deque
+from collections import OrderedDict, deque
 from pathlib import Path
 from typing import Any
 
@@ -20,6 +20,7 @@ except Exception:  # pragma: no cover - optional dependency import guard
 
 
 EXEC_EXTENSIONS = {".app", ".pkg", ".dmg"}
+DEBOUNCE_CACHE_MAX = 4096
 
 
 def _is_home_subpath(path: Path) -> bool:
@@ -35,7 +36,9 @@ class _DebouncedHandler(FileSystemEventHandler):  # type: ignore[misc]
     def __init__(self, queue: deque[dict[str, Any]], debounce_seconds: float = 2.0) -> None:
         self.queue = queue
         self.debounce_seconds = debounce_seconds
-        self._seen: dict[str, float] = {}
+        # Insertion-ordered by last emit time: expired keys are pruned from the front and the
+        # size is capped, so long sessions touching many paths do not grow it without bound.
+        self._seen: OrderedDict[str, float] = OrderedDict()
         self._lock = threading.Lock()
 
     def on_any_event(self, event: FileSystemEvent) -> None:
@@ -46,12 +49,18 @@ class _DebouncedHandler(FileSystemEventHandler):  # type: ignore[misc]
         dest_path = str(getattr(event, "dest_path", ""))
         key = f"{event_type}:{src_path}:{dest_path}"
 
-        now = time.time()
+        now = time.monotonic()
         with self._lock:
             last = self._seen.get(key)
             if last is not None and (now - last) < self.debounce_seconds:
                 return
             self._seen[key] = now
+            self._seen.move_to_end(key)
+            while self._seen:
+                oldest_key, oldest = next(iter(self._seen.items()))
+                if len(self._seen) <= DEBOUNCE_CACHE_MAX and (now - oldest) < self.debounce_seconds:
+                    break
+                del self._seen[oldest_key]
 
         payload = {
             "event_type": event_type,
@@ -103,22 +112,21 @@ class FileWatchService:
         while self._queue:
             item = self._queue.popleft()
             path_str = item.get("dest_path") or item.get("src_path") or ""
-            path = Path(path_str)
             severity = Severity.INFO
             title = "File change detected"
 
-            if path.suffix.lower() in EXEC_EXTENSIONS and "Downloads" in path_str:
+            if os.path.splitext(path_str)[1].lower() in EXEC_EXTENSIONS and "Downloads" in path_str:
                 severity = Severity.WARN
                 title = "Installer artifact detected in Downloads"
 
-            if path.exists():
-                try:
-                    mode = path.stat().st_mode
-                    if mode & 0o111:
-                        severity = Severity.HIGH
-                        title = "Executable file change detected"
-                except OSError:
-                    pass
+            # One stat() both checks existence and reads the mode; no Path objects per event.
+            try:
+                mode = os.stat(path_str).st_mode
+            except OSError:
+                mode = 0
+            if mode & 0o111:
+                severity = Severity.HIGH
+                title = "Executable file change detected"
 
             out.append(
                 EventIn(
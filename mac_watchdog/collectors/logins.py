@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import re
 import subprocess
+import threading
 
 from mac_watchdog.config import AppConfig
 from mac_watchdog.db import Database
@@ -19,11 +21,18 @@ LOG_CMD = [
 
 MAX_LOG_OUTPUT = 100_000
 MAX_EXCERPTS = 10
+LOG_TIMEOUT_SECONDS = 8
 
 
 FAIL_MARKERS = ("fail", "denied", "invalid", "error")
 SUCCESS_MARKERS = ("succeeded", "success", "accepted")
 
+# Compiled once: each streamed line is gated on auth/login, then classified with one search per
+# marker group (failures take precedence).
+_AUTH_RE = re.compile("auth|login", re.IGNORECASE)
+_FAIL_RE = re.compile("|".join(map(re.escape, FAIL_MARKERS)), re.IGNORECASE)
+_SUCCESS_RE = re.compile("|".join(map(re.escape, SUCCESS_MARKERS)), re.IGNORECASE)
+
 
 def _truncate(value: str, limit: int = 400) -> str:
     return value[:limit] if len(value) > limit else value
@@ -34,65 +43,105 @@ def collect_login_events(config: AppConfig, db: Database) -> CollectorResult:
 
     events: list[EventIn] = []
     try:
-        result = subprocess.run(
+        proc = subprocess.Popen(
             LOG_CMD,
-            check=False,
-            capture_output=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
             text=True,
-            timeout=8,
+            errors="replace",
         )
-    except subprocess.TimeoutExpired:
+    except Exception as exc:
         events.append(
             EventIn(
                 source=Source.LOGIN,
                 severity=Severity.WARN,
-                title="Login collector timeout",
-                details={"timeout_seconds": 8},
+                title="Login collector execution error",
+                details={"error": str(exc)},
             )
         )
         return CollectorResult(events=events)
-    except Exception as exc:
+
+    stdout_pipe, stderr_pipe = proc.stdout, proc.stderr
+    if stdout_pipe is None or stderr_pipe is None:
+        raise RuntimeError("log command output is not piped")
+
+    # Lines are scanned as they stream in, so only matched excerpts are kept rather than the
+    # whole (up to MAX_LOG_OUTPUT) buffer; the timer enforces the overall timeout.
+    timed_out = threading.Event()
+
+    def _kill_on_timeout() -> None:
+        timed_out.set()
+        proc.kill()
+
+    # stderr is drained concurrently: left unread, a chatty child would fill the pipe, block,
+    # and never close stdout. Only the first MAX_LOG_OUTPUT characters are kept.
+    stderr_parts: list[str] = []
+
+    def _drain_stderr() -> None:
+        kept = 0
+        try:
+            for chunk in iter(lambda: stderr_pipe.read(8192), ""):
+                if kept < MAX_LOG_OUTPUT:
+                    stderr_parts.append(chunk[: MAX_LOG_OUTPUT - kept])
+                    kept += len(stderr_parts[-1])
+        except (OSError, ValueError):
+            pass
+
+    stderr_reader = threading.Thread(target=_drain_stderr, daemon=True)
+    stderr_reader.start()
+    timer = threading.Timer(LOG_TIMEOUT_SECONDS, _kill_on_timeout)
+    timer.daemon = True
+    timer.start()
+    failures: list[str] = []
+    successes: list[str] = []
+    matched_lines = 0
+    truncated = False
+    try:
+        read_chars = 0
+        for raw_line in stdout_pipe:
+            read_chars += len(raw_line)
+            if read_chars > MAX_LOG_OUTPUT:
+                truncated = True
+                proc.kill()
+                break
+            if not _AUTH_RE.search(raw_line):
+                continue
+            line = raw_line.strip()
+            matched_lines += 1
+            if _FAIL_RE.search(line):
+                failures.append(_truncate(line))
+            elif _SUCCESS_RE.search(line):
+                successes.append(_truncate(line))
+        return_code = proc.wait()
+        stderr_reader.join(timeout=1)
+    finally:
+        timer.cancel()
+        stdout_pipe.close()
+        stderr_pipe.close()
+    stderr = "".join(stderr_parts)
+
+    if timed_out.is_set():
         events.append(
             EventIn(
                 source=Source.LOGIN,
                 severity=Severity.WARN,
-                title="Login collector execution error",
-                details={"error": str(exc)},
+                title="Login collector timeout",
+                details={"timeout_seconds": LOG_TIMEOUT_SECONDS},
             )
         )
         return CollectorResult(events=events)
 
-    stdout = result.stdout[:MAX_LOG_OUTPUT]
-    stderr = result.stderr[:MAX_LOG_OUTPUT]
-
-    if result.returncode != 0:
+    if return_code != 0 and not truncated:
         events.append(
             EventIn(
                 source=Source.LOGIN,
                 severity=Severity.WARN,
                 title="Login collector command failed",
-                details={"return_code": result.returncode, "stderr": _truncate(stderr)},
+                details={"return_code": return_code, "stderr": _truncate(stderr)},
             )
         )
         return CollectorResult(events=events)
 
-    failures: list[str] = []
-    successes: list[str] = []
-    matched_lines = 0
-
-    for raw_line in stdout.splitlines():
-        line = raw_line.strip()
-        if not line:
-            continue
-        lowered = line.lower()
-        if "auth" not in lowered and "login" not in lowered:
-            continue
-        matched_lines += 1
-        if any(marker in lowered for marker in FAIL_MARKERS):
-            failures.append(_truncate(line))
-        elif any(marker in lowered for marker in SUCCESS_MARKERS):
-            successes.append(_truncate(line))
-
     if failures:
         severity = Severity.HIGH if len(failures) >= 5 else Severity.WARN
         events.append(
@@ -114,12 +163,4 @@ def collect_login_events(config: AppConfig, db: Database) -> CollectorResult:
             )
         )
 
-    events.append(
-        EventIn(
-            source=Source.LOGIN,
-            severity=Severity.INFO,
-            title="Login log scan completed",
-            details={"matched_lines": matched_lines},
-        )
-    )
     return CollectorResult(events=events, metadata={"matched_lines": matched_lines})
@@ -10,7 +10,17 @@ from mac_watchdog.config import AppConfig
 from mac_watchdog.db import Database
 from mac_watchdog.models import CollectorResult, EventIn, Severity, Source
 
-SNAPSHOT_KEY = "network_listeners"
+_ALL_INTERFACES_LISTENER = (Severity.HIGH, "New external listener on all interfaces")
+_LOCALHOST_LISTENER = (Severity.WARN, "New localhost listener detected")
+_OTHER_LISTENER = (Severity.HIGH, "New listener on non-loopback interface")
+# Bind address -> (severity, title) for a new listener whose process is not denylisted.
+_LISTENER_CATEGORIES: dict[str, tuple[Severity, str]] = {
+    "0.0.0.0": _ALL_INTERFACES_LISTENER,
+    "::": _ALL_INTERFACES_LISTENER,
+    "127.0.0.1": _LOCALHOST_LISTENER,
+    "::1": _LOCALHOST_LISTENER,
+    "localhost": _LOCALHOST_LISTENER,
+}
 
 
 def _listener_key(item: dict[str, Any]) -> str:
@@ -25,6 +35,17 @@ def _family_name(value: Any) -> str:
     return str(value)
 
 
+def _process_names() -> dict[int, str | None]:
+    # One process-table walk replaces a Process() construction and name() call per listener;
+    # process_iter already skips processes that exit mid-walk.
+    try:
+        return {
+            proc.info["pid"]: proc.info["name"] for proc in psutil.process_iter(["pid", "name"])
+        }
+    except Exception:
+        return {}
+
+
 def collect_network_events(config: AppConfig, db: Database) -> CollectorResult:
     events: list[EventIn] = []
     listeners: list[dict[str, Any]] = []
@@ -42,6 +63,7 @@ def collect_network_events(config: AppConfig, db: Database) -> CollectorResult:
         )
         return CollectorResult(events=events)
 
+    name_by_pid: dict[int, str | None] | None = None
     for conn in conns:
         status = getattr(conn, "status", "")
         if status != psutil.CONN_LISTEN and status != "LISTEN":
@@ -61,14 +83,9 @@ def collect_network_events(config: AppConfig, db: Database) -> CollectorResult:
                 continue
 
         pid = getattr(conn, "pid", None)
-        process_name: str | None = None
-        if pid is not None:
-            try:
-                process_name = psutil.Process(pid).name()
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                process_name = None
-            except Exception:
-                process_name = None
+        if pid is not None and name_by_pid is None:
+            name_by_pid = _process_names()
+        process_name = name_by_pid.get(pid) if pid is not None and name_by_pid else None
 
         listeners.append(
             {
@@ -82,33 +99,26 @@ def collect_network_events(config: AppConfig, db: Database) -> CollectorResult:
 
     listeners.sort(key=lambda item: (item["ip"], item["port"], item.get("process_name") or ""))
 
-    previous_snapshot = db.get_latest_snapshot(SNAPSHOT_KEY)
-    previous_items = previous_snapshot["blob"] if previous_snapshot else []
-    prev_keys = {_listener_key(item) for item in previous_items if isinstance(item, dict)}
+    # Each key is built once and reused for the delta write and the new-listener check.
+    keyed = [(_listener_key(item), item) for item in listeners]
+    # Only listeners that appeared or went away since the last cycle are written.
+    added_keys = db.sync_network_listeners(dict(keyed), datetime.now(UTC).isoformat())
 
     new_listeners: list[dict[str, Any]] = []
-    deny_names = [name.lower() for name in config.deny_process_names]
+    deny_pattern = config.deny_name_pattern
 
-    for listener in listeners:
-        key = _listener_key(listener)
-        if key in prev_keys:
+    for key, listener in keyed:
+        if key not in added_keys:
             continue
         new_listeners.append(listener)
 
         ip = listener["ip"]
         pname = (listener.get("process_name") or "").lower()
-        if any(deny in pname for deny in deny_names):
+        if deny_pattern is not None and deny_pattern.search(pname):
             severity = Severity.HIGH
             title = "Denylisted process opened listener"
-        elif ip in {"0.0.0.0", "::"}:
-            severity = Severity.HIGH
-            title = "New external listener on all interfaces"
-        elif ip in {"127.0.0.1", "::1", "localhost"}:
-            severity = Severity.WARN
-            title = "New localhost listener detected"
         else:
-            severity = Severity.HIGH
-            title = "New listener on non-loopback interface"
+            severity, title = _LISTENER_CATEGORIES.get(ip, _OTHER_LISTENER)
 
         events.append(
             EventIn(
@@ -119,16 +129,6 @@ def collect_network_events(config: AppConfig, db: Database) -> CollectorResult:
             )
         )
 
-    db.set_latest_snapshot(SNAPSHOT_KEY, listeners, datetime.now(UTC).isoformat())
-    events.append(
-        EventIn(
-            source=Source.NETWORK,
-            severity=Severity.INFO,
-            title="Network listener snapshot completed",
-            details={"listener_count": len(listeners), "new_listeners": len(new_listeners)},
-        )
-    )
-
     return CollectorResult(
         events=events,
         metadata={"listener_count": len(listeners), "new_listener_count": len(new_listeners)},
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+from collections.abc import Callable
 from datetime import UTC, datetime
 from pathlib import Path
+from typing import Any
 
 import psutil
 
@@ -10,7 +12,28 @@ from mac_watchdog.db import Database
 from mac_watchdog.models import CollectorResult, EventIn, Severity, Source
 
 
-PROCESS_ATTRS = ["pid", "name", "username", "create_time", "exe"]
+# Resolving touches the filesystem and the home directory does not move while the watchdog runs.
+_DOWNLOADS_DIR = str((Path.home() / "Downloads").resolve(strict=False))
+
+
+def _read_field(getter: Callable[[], Any]) -> Any:
+    # Matches process_iter(attrs=...) semantics: a field we may not read (or a zombie's)
+    # becomes None, while NoSuchProcess still propagates so the caller skips the process.
+    try:
+        return getter()
+    except (psutil.AccessDenied, psutil.ZombieProcess):
+        return None
+
+
+def _read_process(proc: psutil.Process) -> tuple[str, str, str, float | None]:
+    # oneshot() lets name/username/exe/create_time share the per-process syscalls.
+    with proc.oneshot():
+        return (
+            str(_read_field(proc.name) or "unknown"),
+            str(_read_field(proc.username) or "unknown"),
+            str(_read_field(proc.exe) or ""),
+            _read_field(proc.create_time),
+        )
 
 
 def _to_iso(create_time: float | None) -> str | None:
@@ -19,9 +42,21 @@ def _to_iso(create_time: float | None) -> str | None:
     return datetime.fromtimestamp(create_time, tz=UTC).isoformat()
 
 
-def _is_unusual_path(exe: str, unusual_paths: list[str]) -> bool:
-    exe_path = Path(exe).expanduser().resolve(strict=False)
-    return any(str(exe_path).startswith(prefix) for prefix in unusual_paths)
+def _is_unusual_path(exe: str, unusual_paths: tuple[str, ...]) -> bool:
+    # psutil reports absolute, already-resolved executables; only hit the filesystem to resolve
+    # the rare path that is relative or still has ~ or dot segments.
+    if not exe.startswith("/") or "~" in exe or "/." in exe:
+        exe = str(Path(exe).expanduser().resolve(strict=False))
+    return exe.startswith(unusual_paths)
+
+
+def _inspection_error(exc: Exception) -> EventIn:
+    return EventIn(
+        source=Source.PROCESS,
+        severity=Severity.WARN,
+        title="Process inspection error",
+        details={"error": str(exc)},
+    )
 
 
 def collect_process_events(config: AppConfig, db: Database) -> CollectorResult:
@@ -30,14 +65,17 @@ def collect_process_events(config: AppConfig, db: Database) -> CollectorResult:
     process_count = 0
     new_processes = 0
 
-    unusual_paths = list(config.unusual_exec_paths)
-    unusual_paths.append(str((Path.home() / "Downloads").resolve(strict=False)))
+    # Directory prefixes end in "/" so /tmp does not also match /tmpfoo.
+    unusual_paths = tuple(
+        prefix.rstrip("/") + "/"
+        for prefix in [*config.unusual_exec_paths, _DOWNLOADS_DIR]
+    )
 
-    deny_names = [item.lower() for item in config.deny_process_names]
-    allow_paths = config.allow_process_paths
+    deny_pattern = config.deny_name_pattern
+    allow_pattern = config.allow_path_pattern
 
     try:
-        iterator = psutil.process_iter(attrs=PROCESS_ATTRS)
+        iterator = psutil.process_iter()
     except Exception as exc:  # pragma: no cover - defensive catch
         events.append(
             EventIn(
@@ -49,20 +87,28 @@ def collect_process_events(config: AppConfig, db: Database) -> CollectorResult:
         )
         return CollectorResult(events=events)
 
+    snapshot: list[tuple[int, str, str, str, str | None, str]] = []
     for proc in iterator:
         process_count += 1
         try:
-            info = proc.info
-            pid = info.get("pid")
-            name = str(info.get("name") or "unknown")
-            username = str(info.get("username") or "unknown")
-            exe = str(info.get("exe") or "")
-            started = _to_iso(info.get("create_time"))
+            name, username, exe, create_time = _read_process(proc)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+        except Exception as exc:
+            events.append(_inspection_error(exc))
+            continue
+        process_key = f"{name}|{exe}|{username}"
+        snapshot.append((proc.pid, name, username, exe, _to_iso(create_time), process_key))
 
-            process_key = f"{name}|{exe}|{username}"
-            is_new = db.touch_process_seen(process_key, now)
+    # The whole snapshot is recorded in one transaction; a key shared by several PIDs is only
+    # new for the first of them, as with per-process touches.
+    new_keys = db.touch_process_seen_batch([item[5] for item in snapshot], now)
 
+    for pid, name, username, exe, started, process_key in snapshot:
+        try:
+            is_new = process_key in new_keys
             if is_new:
+                new_keys.discard(process_key)
                 new_processes += 1
                 events.append(
                     EventIn(
@@ -89,8 +135,7 @@ def collect_process_events(config: AppConfig, db: Database) -> CollectorResult:
                     )
                 )
 
-            lowered = name.lower()
-            if any(pattern in lowered for pattern in deny_names):
+            if deny_pattern is not None and deny_pattern.search(name.lower()):
                 events.append(
                     EventIn(
                         source=Source.PROCESS,
@@ -100,7 +145,7 @@ def collect_process_events(config: AppConfig, db: Database) -> CollectorResult:
                     )
                 )
 
-            if allow_paths and exe and not any(allowed in exe for allowed in allow_paths) and is_new:
+            if allow_pattern is not None and exe and is_new and not allow_pattern.search(exe):
                 events.append(
                     EventIn(
                         source=Source.PROCESS,
@@ -109,24 +154,10 @@ def collect_process_events(config: AppConfig, db: Database) -> CollectorResult:
                         details={"pid": pid, "name": name, "exe": exe},
                     )
                 )
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            continue
         except Exception as exc:
-            events.append(
-                EventIn(
-                    source=Source.PROCESS,
-                    severity=Severity.WARN,
-                    title="Process inspection error",
-                    details={"error": str(exc)},
-                )
-            )
+            events.append(_inspection_error(exc))
 
-    events.append(
-        EventIn(
-            source=Source.PROCESS,
-            severity=Severity.INFO,
-            title="Process snapshot completed",
-            details={"process_count": process_count, "new_processes": new_processes},
-        )
+    return CollectorResult(
+        events=events,
+        metadata={"process_count": process_count, "new_processes": new_processes},
     )
-    return CollectorResult(events=events, metadata={"process_count": process_count})
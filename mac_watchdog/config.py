@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import functools
 import ipaddress
 import os
+import re
 import stat
 import tomllib
 from pathlib import Path
@@ -14,6 +16,13 @@ DEFAULT_CONFIG_PATH = DEFAULT_DATA_DIR / "config.toml"
 DEFAULT_DB_PATH = DEFAULT_DATA_DIR / "mac_watchdog.db"
 
 
+def _substring_pattern(terms: tuple[str, ...]) -> re.Pattern[str] | None:
+    # One alternation scans each candidate once instead of once per term.
+    if not terms:
+        return None
+    return re.compile("|".join(map(re.escape, terms)))
+
+
 class AppConfig(BaseModel):
     model_config = ConfigDict(extra="forbid", strict=True)
     _data_dir: Path = PrivateAttr(default=DEFAULT_DATA_DIR)
@@ -92,6 +101,21 @@ class AppConfig(BaseModel):
                 raise ValueError(f"severity weight for {key} must be >= 0")
         return value
 
+    # A loaded config is not mutated, so the derived matchers are computed once per instance.
+    @functools.cached_property
+    def deny_lower(self) -> tuple[str, ...]:
+        return tuple(item.lower() for item in self.deny_process_names)
+
+    @functools.cached_property
+    def deny_name_pattern(self) -> re.Pattern[str] | None:
+        """Matches a lowercased process name containing any denylisted name."""
+        return _substring_pattern(self.deny_lower)
+
+    @functools.cached_property
+    def allow_path_pattern(self) -> re.Pattern[str] | None:
+        """Matches an executable path containing any allowed path."""
+        return _substring_pattern(tuple(self.allow_process_paths))
+
     @property
     def data_dir(self) -> Path:
         return self._data_dir
@@ -1,17 +1,50 @@
 from __future__ import annotations
 
 import json
+import queue
 import sqlite3
 import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
 
+import orjson
+
 from mac_watchdog.config import secure_path
 from mac_watchdog.migrations import apply_migrations, current_version
 from mac_watchdog.models import EventIn
 from mac_watchdog.sanitizer import safe_json_dumps, sanitize_text
 
+# Hot-path statements are kept as constants: sqlite3 caches prepared statements by SQL text,
+# so every call reuses one compiled statement instead of re-parsing.
+_INSERT_EVENT_SQL = (
+    "INSERT INTO events(ts, source, severity, title, details_json) VALUES(?,?,?,?,?)"
+)
+_INSERT_PROCESS_SEEN_SQL = (
+    "INSERT INTO process_seen(process_key, first_seen, last_seen) VALUES(?,?,?)"
+)
+_INSERT_NEW_PROCESS_SEEN_SQL = (
+    "INSERT OR IGNORE INTO process_seen(process_key, first_seen, last_seen) VALUES(?,?,?)"
+)
+_UPDATE_PROCESS_SEEN_SQL = "UPDATE process_seen SET last_seen = ? WHERE process_key = ?"
+_SELECT_SEEN_KEYS_SQL = "SELECT process_key FROM process_seen WHERE process_key IN ("
+
+
+def _json_loads(text: str) -> Any:
+    # Rows written before the orjson switch may hold NaN/Infinity, which only the stdlib accepts;
+    # its JSONDecodeError is left to the caller.
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        return json.loads(text)
+
+
+# WAL lets readers run alongside the writer, so web-facing reads use their own connections
+# instead of queueing behind collector writes on the shared writer lock.
+READ_POOL_SIZE = 4
+
 
 class Database:
     def __init__(self, db_path: Path) -> None:
@@ -26,18 +59,49 @@ class Database:
         self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
         self._conn.row_factory = sqlite3.Row
         self._lock = threading.RLock()
+        self._in_transaction = False
         self._init_schema()
         secure_path(self.db_path, 0o600)
+        self._closed = False
+        # None in the pool is the closed marker; it wakes callers blocked on an empty pool.
+        self._readers: queue.SimpleQueue[sqlite3.Connection | None] = queue.SimpleQueue()
+        self._reader_conns: list[sqlite3.Connection] = []
+        for _ in range(READ_POOL_SIZE):
+            reader = sqlite3.connect(self.db_path, check_same_thread=False)
+            reader.row_factory = sqlite3.Row
+            reader.execute("PRAGMA query_only=ON;")
+            self._reader_conns.append(reader)
+            self._readers.put(reader)
 
     def close(self) -> None:
+        # Readers are closed directly rather than checked out, so a request still holding one
+        # cannot stall shutdown; its next statement fails instead.
+        self._closed = True
+        for reader in self._reader_conns:
+            reader.close()
+        self._readers.put(None)
         with self._lock:
             self._conn.close()
 
+    @contextmanager
+    def _reader(self) -> Iterator[sqlite3.Connection]:
+        conn = None if self._closed else self._readers.get()
+        if conn is None:
+            self._readers.put(None)
+            raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
     def _init_schema(self) -> None:
         with self._lock, self._conn:
             self._conn.execute("PRAGMA journal_mode=WAL;")
             self._conn.execute("PRAGMA synchronous=NORMAL;")
             self._conn.execute("PRAGMA foreign_keys=ON;")
+            self._conn.execute("PRAGMA temp_store=MEMORY;")
+            self._conn.execute("PRAGMA mmap_size=268435456;")
+            self._conn.execute("PRAGMA cache_size=-20000;")
             self._conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS events(
@@ -76,15 +140,49 @@ class Database:
                 )
                 """
             )
-            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_events_ts ON events(ts)")
             self._conn.execute("CREATE INDEX IF NOT EXISTS idx_events_source ON events(source)")
-            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_events_severity ON events(severity)")
+            # (ts, severity) answers the since-ts severity counts from the index alone and serves
+            # every ts-ordered or ts-ranged scan, so the single-column ts and severity indexes are
+            # dropped instead of being maintained on each insert.
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_events_ts_severity ON events(ts, severity)"
+            )
+            self._conn.execute("DROP INDEX IF EXISTS idx_events_ts")
+            self._conn.execute("DROP INDEX IF EXISTS idx_events_severity")
             apply_migrations(self._conn)
 
     def migration_version(self) -> int:
         with self._lock:
             return current_version(self._conn)
 
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Group several writes into one BEGIN IMMEDIATE ... COMMIT (one WAL commit)."""
+        with self._lock:
+            if self._in_transaction:
+                yield
+                return
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._in_transaction = True
+            try:
+                yield
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+            finally:
+                self._in_transaction = False
+
+    @contextmanager
+    def _write(self) -> Iterator[None]:
+        # Inside transaction() the outer block owns the commit; otherwise each write commits.
+        with self._lock:
+            if self._in_transaction:
+                yield
+            else:
+                with self._conn:
+                    yield
+
     def fetch_all(self, query: str, params: tuple[Any, ...] = ()) -> list[sqlite3.Row]:
         with self._lock:
             return self._conn.execute(query, params).fetchall()
@@ -94,11 +192,11 @@ class Database:
             return self._conn.execute(query, params).fetchone()
 
     def execute(self, query: str, params: tuple[Any, ...] = ()) -> None:
-        with self._lock, self._conn:
+        with self._write():
             self._conn.execute(query, params)
 
     def execute_many(self, query: str, params: list[tuple[Any, ...]]) -> None:
-        with self._lock, self._conn:
+        with self._write():
             self._conn.executemany(query, params)
 
     def insert_event(self, event: EventIn) -> None:
@@ -107,45 +205,60 @@ class Database:
     def insert_events(self, events: list[EventIn]) -> int:
         if not events:
             return 0
-        rows: list[tuple[str, str, str, str, str]] = []
-        for event in events:
-            rows.append(
-                (
-                    sanitize_text(event.ts),
-                    sanitize_text(event.source.value),
-                    sanitize_text(event.severity.value),
-                    sanitize_text(event.title),
-                    safe_json_dumps(event.details),
-                )
-            )
-        with self._lock, self._conn:
-            self._conn.executemany(
-                "INSERT INTO events(ts, source, severity, title, details_json) VALUES(?,?,?,?,?)", rows
+        rows = [
+            (
+                sanitize_text(event.ts),
+                sanitize_text(event.source.value),
+                sanitize_text(event.severity.value),
+                sanitize_text(event.title),
+                safe_json_dumps(event.details),
             )
+            for event in events
+        ]
+        with self._write():
+            self._conn.executemany(_INSERT_EVENT_SQL, rows)
         return len(rows)
 
     def touch_process_seen(self, process_key: str, now_ts: str | None = None) -> bool:
         ts = now_ts or datetime.now(UTC).isoformat()
         key = sanitize_text(process_key)
-        with self._lock, self._conn:
+        with self._write():
             existing = self._conn.execute(
                 "SELECT 1 FROM process_seen WHERE process_key = ?", (key,)
             ).fetchone()
             if existing is None:
-                self._conn.execute(
-                    "INSERT INTO process_seen(process_key, first_seen, last_seen) VALUES(?,?,?)",
-                    (key, ts, ts),
-                )
+                self._conn.execute(_INSERT_PROCESS_SEEN_SQL, (key, ts, ts))
                 return True
-            self._conn.execute(
-                "UPDATE process_seen SET last_seen = ? WHERE process_key = ?",
-                (ts, key),
-            )
+            self._conn.execute(_UPDATE_PROCESS_SEEN_SQL, (ts, key))
             return False
 
+    def touch_process_seen_batch(
+        self, process_keys: list[str], now_ts: str | None = None
+    ) -> set[str]:
+        """Touch a whole process snapshot in one transaction; returns the first-seen keys."""
+        ts = now_ts or datetime.now(UTC).isoformat()
+        by_key: dict[str, list[str]] = {}
+        for process_key in process_keys:
+            by_key.setdefault(sanitize_text(process_key), []).append(process_key)
+        keys = list(by_key)
+        existing: set[str] = set()
+        with self._write():
+            # Chunked to stay well under SQLite's bound-parameter limit.
+            for start in range(0, len(keys), 500):
+                chunk = keys[start : start + 500]
+                # Only "?" markers are appended to the constant; the keys themselves are bound.
+                query = _SELECT_SEEN_KEYS_SQL + ",".join("?" for _ in chunk) + ")"
+                rows = self._conn.execute(query, tuple(chunk)).fetchall()
+                existing.update(str(row["process_key"]) for row in rows)
+            self._conn.executemany(
+                _INSERT_NEW_PROCESS_SEEN_SQL, [(key, ts, ts) for key in keys if key not in existing]
+            )
+            self._conn.executemany(_UPDATE_PROCESS_SEEN_SQL, [(ts, key) for key in existing])
+        return {original for key in keys if key not in existing for original in by_key[key]}
+
     def set_latest_snapshot(self, key: str, blob: Any, ts: str | None = None) -> None:
         at = ts or datetime.now(UTC).isoformat()
-        with self._lock, self._conn:
+        with self._write():
             self._conn.execute(
                 """
                 INSERT INTO latest_snapshots(key, ts, blob_json)
@@ -157,35 +270,127 @@ class Database:
             )
 
     def get_latest_snapshot(self, key: str) -> dict[str, Any] | None:
-        with self._lock:
-            row = self._conn.execute(
+        with self._reader() as conn:
+            row = conn.execute(
                 "SELECT ts, blob_json FROM latest_snapshots WHERE key = ?", (sanitize_text(key),)
             ).fetchone()
         if row is None:
             return None
         try:
-            blob = json.loads(row["blob_json"])
+            blob = _json_loads(row["blob_json"])
         except json.JSONDecodeError:
             blob = {}
         return {"ts": row["ts"], "blob": blob}
 
-    def set_app_state(self, key: str, value: str) -> None:
-        with self._lock, self._conn:
+    def sync_network_listeners(
+        self, listeners: dict[str, dict[str, Any]], ts: str | None = None
+    ) -> set[str]:
+        """Store the current listeners as a delta against the previous ones.
+
+        Only added and removed rows are written; returns the keys of added listeners.
+        """
+        at = sanitize_text(ts or datetime.now(UTC).isoformat())
+        current = {sanitize_text(key): key for key in listeners}
+        with self._write():
+            previous = {
+                str(row["key"]) for row in self._conn.execute("SELECT key FROM network_listeners")
+            }
+            added = [key for key in current if key not in previous]
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO network_listeners(key, blob_json, seen_ts) VALUES(?,?,?)",
+                [(key, safe_json_dumps(listeners[current[key]]), at) for key in added],
+            )
+            self._conn.executemany(
+                "DELETE FROM network_listeners WHERE key = ?",
+                [(key,) for key in previous if key not in current],
+            )
             self._conn.execute(
                 """
                 INSERT INTO app_state(key, value)
-                VALUES(?,?)
+                VALUES('network_listeners_ts', ?)
                 ON CONFLICT(key)
                 DO UPDATE SET value = excluded.value
                 """,
-                (sanitize_text(key), sanitize_text(value)),
+                (at,),
             )
+        return {current[key] for key in added}
 
-    def get_app_state(self, key: str) -> str | None:
-        with self._lock:
-            row = self._conn.execute(
-                "SELECT value FROM app_state WHERE key = ?", (sanitize_text(key),)
+    def get_network_listeners(self) -> dict[str, Any] | None:
+        with self._reader() as conn:
+            ts = conn.execute(
+                "SELECT value FROM app_state WHERE key = 'network_listeners_ts'"
             ).fetchone()
+            rows = conn.execute("SELECT blob_json FROM network_listeners").fetchall()
+        if ts is None:
+            return None
+        listeners: list[dict[str, Any]] = []
+        for row in rows:
+            try:
+                item = _json_loads(row["blob_json"])
+            except json.JSONDecodeError:
+                continue
+            if isinstance(item, dict):
+                listeners.append(item)
+        listeners.sort(
+            key=lambda item: (
+                str(item.get("ip")),
+                item.get("port") or 0,
+                item.get("process_name") or "",
+            )
+        )
+        return {"ts": ts["value"], "blob": listeners}
+
+    def record_collector_runs(
+        self, runs: list[tuple[str, dict[str, Any]]], ts: str | None = None
+    ) -> None:
+        """Store per-collector run counts outside the events table."""
+        at = ts or datetime.now(UTC).isoformat()
+        with self._write():
+            self._conn.executemany(
+                "INSERT INTO collector_runs(ts, source, counts_json) VALUES(?,?,?)",
+                [(at, sanitize_text(source), safe_json_dumps(counts)) for source, counts in runs],
+            )
+
+    def latest_collector_runs(self) -> list[dict[str, Any]]:
+        with self._reader() as conn:
+            rows = conn.execute(
+                """
+                SELECT source, MAX(ts) AS ts, counts_json
+                FROM collector_runs
+                GROUP BY source
+                ORDER BY source ASC
+                """
+            ).fetchall()
+        output: list[dict[str, Any]] = []
+        for row in rows:
+            try:
+                counts = _json_loads(row["counts_json"])
+            except json.JSONDecodeError:
+                counts = {}
+            output.append({"source": row["source"], "ts": row["ts"], "counts": counts})
+        return output
+
+    def set_app_state(self, key: str, value: str, *, trusted: bool = False) -> None:
+        # trusted is for internal constants and generated values (timestamps, counters) that
+        # cannot carry control characters or secrets, so sanitization is skipped.
+        if not trusted:
+            key, value = sanitize_text(key), sanitize_text(value)
+        with self._write():
+            self._conn.execute(
+                """
+                INSERT INTO app_state(key, value)
+                VALUES(?,?)
+                ON CONFLICT(key)
+                DO UPDATE SET value = excluded.value
+                """,
+                (key, value),
+            )
+
+    def get_app_state(self, key: str, *, trusted: bool = False) -> str | None:
+        if not trusted:
+            key = sanitize_text(key)
+        with self._reader() as conn:
+            row = conn.execute("SELECT value FROM app_state WHERE key = ?", (key,)).fetchone()
         return None if row is None else str(row["value"])
 
     def get_events(
@@ -223,14 +428,14 @@ class Database:
         )
         params.extend([page_size_safe, offset])
 
-        with self._lock:
-            rows = self._conn.execute(query, tuple(params)).fetchall()
+        with self._reader() as conn:
+            rows = conn.execute(query, tuple(params)).fetchall()
 
         output: list[dict[str, Any]] = []
         for row in rows:
             details: Any
             try:
-                details = json.loads(row["details_json"])
+                details = _json_loads(row["details_json"])
             except json.JSONDecodeError:
                 details = {}
             output.append(
@@ -245,6 +450,26 @@ class Database:
             )
         return output
 
+    def get_event_watermark(self, start_ts: str, end_ts: str) -> tuple[int, int]:
+        """Return (max id, row count) for events in [start_ts, end_ts)."""
+        with self._reader() as conn:
+            row = conn.execute(
+                "SELECT COALESCE(MAX(id), 0) AS max_id, COUNT(*) AS total "
+                "FROM events WHERE ts >= ? AND ts < ?",
+                (sanitize_text(start_ts), sanitize_text(end_ts)),
+            ).fetchone()
+        return int(row["max_id"]), int(row["total"])
+
+    def get_insight_watermark(self) -> tuple[int, int, str]:
+        """Return (max id, open count, latest last_seen) over the insights table."""
+        with self._reader() as conn:
+            row = conn.execute(
+                "SELECT COALESCE(MAX(id), 0) AS max_id, "
+                "COALESCE(SUM(status = 'open'), 0) AS open_count, "
+                "COALESCE(MAX(last_seen), '') AS last_seen FROM insights"
+            ).fetchone()
+        return int(row["max_id"]), int(row["open_count"]), str(row["last_seen"])
+
     def get_events_between(
         self,
         start_ts: str,
@@ -267,7 +492,7 @@ class Database:
         for row in rows:
             details: Any
             try:
-                details = json.loads(row["details_json"])
+                details = _json_loads(row["details_json"])
             except json.JSONDecodeError:
                 details = {}
             out.append(
@@ -292,16 +517,16 @@ class Database:
             params = ()
         sql += " GROUP BY severity"
 
-        with self._lock:
-            rows = self._conn.execute(sql, params).fetchall()
+        with self._reader() as conn:
+            rows = conn.execute(sql, params).fetchall()
         result = {"INFO": 0, "WARN": 0, "HIGH": 0}
         for row in rows:
             result[str(row["severity"])] = int(row["c"])
         return result
 
     def total_events(self) -> int:
-        with self._lock:
-            row = self._conn.execute("SELECT COUNT(*) AS c FROM events").fetchone()
+        with self._reader() as conn:
+            row = conn.execute("SELECT COUNT(*) AS c FROM events").fetchone()
         return 0 if row is None else int(row["c"])
 
     def latest_events(self, limit: int = 20) -> list[dict[str, Any]]:
@@ -31,10 +31,13 @@ def compute_baseline_deltas(
     prior_days: list[dict[str, int]],
 ) -> dict[str, BaselineDelta]:
     output: dict[str, BaselineDelta] = {}
-    for signal in SIGNAL_KEYS:
+    # One pass over the history reads every signal of a day; zip transposes rows into
+    # per-signal columns (no history means an empty column for each signal).
+    rows = [tuple(int(day.get(signal, 0)) for signal in SIGNAL_KEYS) for day in prior_days]
+    columns = list(zip(*rows, strict=True)) if rows else [() for _ in SIGNAL_KEYS]
+    for signal, history in zip(SIGNAL_KEYS, columns, strict=True):
         today_value = int(today_signals.get(signal, 0))
-        history = [int(day.get(signal, 0)) for day in prior_days]
-        baseline_value = compute_median(history)
+        baseline_value = compute_median(list(history))
         ratio = today_value / max(1.0, baseline_value)
         output[signal] = BaselineDelta(
             signal=signal,  # type: ignore[arg-type]
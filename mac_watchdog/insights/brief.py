@@ -1,7 +1,5 @@
 from __future__ import annotations
 
-from statistics import mean
-
 from mac_watchdog.insights.schemas import BaselineClassification, BaselineDelta, DailyBrief, RiskDriver
 
 
@@ -45,7 +43,7 @@ def compose_daily_brief(
     action_texts: list[str],
     extra_titles: list[str],
 ) -> DailyBrief:
-    avg_7d = mean(recent_risk_scores) if recent_risk_scores else 0.0
+    avg_7d = sum(recent_risk_scores) / len(recent_risk_scores) if recent_risk_scores else 0.0
     delta = round(risk_score - avg_7d, 2)
     driver = drivers[0] if drivers else None
 
@@ -1,12 +1,15 @@
 from __future__ import annotations
 
+import functools
 import hashlib
 import json
-import re
 from datetime import UTC, datetime, timedelta
 from typing import Any
 
-NORMALIZE_RE = re.compile(r"\s+")
+# Fingerprint fields are joined with the ASCII unit separator: title normalisation collapses
+# it as whitespace and repr() escapes it inside evidence values. Fingerprints are dedup keys,
+# not a security boundary, so a 128-bit BLAKE2b digest is ample.
+FIELD_SEPARATOR = b"\x1f"
 STABLE_KEYS = (
     "ip",
     "port",
@@ -22,46 +25,56 @@ STABLE_KEYS = (
     "signal",
     "classification",
 )
+STABLE_KEY_SET = frozenset(STABLE_KEYS)
 
 
 def normalize_title(title: str) -> str:
-    lowered = title.strip().lower()
-    return NORMALIZE_RE.sub(" ", lowered)
+    return " ".join(title.lower().split())
 
 
 def stable_evidence_slice(evidence: dict[str, Any]) -> dict[str, Any]:
-    stable: dict[str, Any] = {}
-    for key in STABLE_KEYS:
-        if key in evidence:
-            stable[key] = evidence[key]
-    if not stable:
-        for key in sorted(evidence.keys()):
-            value = evidence[key]
-            if isinstance(value, (str, int, float, bool)) or value is None:
-                stable[key] = value
-    return stable
+    # Key order is irrelevant here: build_fingerprint sorts the slice when hashing it.
+    if stable_keys := STABLE_KEY_SET.intersection(evidence):
+        return {key: evidence[key] for key in stable_keys}
+    return {
+        key: value
+        for key, value in evidence.items()
+        if isinstance(value, (str, int, float, bool)) or value is None
+    }
+
+
+def stable_value(value: Any) -> str:
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=True)
+    return repr(value)
 
 
 def build_fingerprint(source: str, title: str, evidence: dict[str, Any]) -> str:
-    payload = {
-        "source": source.strip().lower(),
-        "title": normalize_title(title),
-        "stable": stable_evidence_slice(evidence),
-    }
-    raw = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=True)
-    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+    stable = stable_evidence_slice(evidence)
+    fields = [source.strip().lower().encode("utf-8"), normalize_title(title).encode("utf-8")]
+    fields.extend(
+        f"{key}={stable_value(stable[key])}".encode("utf-8", "backslashreplace")
+        for key in sorted(stable)
+    )
+    return hashlib.blake2b(FIELD_SEPARATOR.join(fields), digest_size=16).hexdigest()
+
+
+@functools.lru_cache(maxsize=2048)
+def _parse_iso(value: str) -> datetime:
+    # A cycle checks many insights against the same now_ts, and last_seen values repeat
+    # across insights recorded in the same cycle.
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=UTC)
+    return parsed
 
 
 def within_window(last_seen: str, now_ts: str, window_minutes: int) -> bool:
     if window_minutes <= 0:
         return False
     try:
-        last = datetime.fromisoformat(last_seen)
-        now = datetime.fromisoformat(now_ts)
+        last = _parse_iso(last_seen)
+        now = _parse_iso(now_ts)
     except ValueError:
         return False
-    if last.tzinfo is None:
-        last = last.replace(tzinfo=UTC)
-    if now.tzinfo is None:
-        now = now.replace(tzinfo=UTC)
     return (now - last) <= timedelta(minutes=window_minutes)
@@ -1,14 +1,17 @@
 from __future__ import annotations
 
+import functools
 import hashlib
-import json
+from collections.abc import Iterator
+from operator import itemgetter
 from typing import Any
 
-HIGH_RISK_LEVELS = {"WARN", "HIGH"}
-
+from mac_watchdog.insights.dedup import FIELD_SEPARATOR, stable_value
 
-def _stable_json(value: dict[str, Any]) -> str:
-    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=True)
+HIGH_RISK_LEVELS = {"WARN", "HIGH"}
+_SEEN_TODAY = 1
+_SEEN_YESTERDAY = 2
+_fingerprint_of = itemgetter("fingerprint")
 
 
 def _risk_identity(event: dict[str, Any]) -> dict[str, Any]:
@@ -47,9 +50,25 @@ def _risk_identity(event: dict[str, Any]) -> dict[str, Any]:
     return {"source": source, "title": title}
 
 
+def _identity_bytes(identity: dict[str, Any]) -> bytes:
+    # _risk_identity builds each source's keys in a fixed order, so no sort is needed.
+    return FIELD_SEPARATOR.join(
+        f"{key}={stable_value(value)}".encode("utf-8", "backslashreplace")
+        for key, value in identity.items()
+    )
+
+
+@functools.lru_cache(maxsize=4096)
+def _identity_digest(raw: bytes) -> str:
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
 def _to_delta_record(event: dict[str, Any]) -> dict[str, Any]:
     identity = _risk_identity(event)
-    digest = hashlib.sha256(_stable_json(identity).encode("utf-8")).hexdigest()
+    # Each cycle re-reads today's and yesterday's events, so most identities repeat. The
+    # digest is memoised on the encoded bytes, which keep 1/True/1.0 apart where a
+    # tuple-of-items key would not.
+    digest = _identity_digest(_identity_bytes(identity))
     return {
         "fingerprint": digest,
         "title": str(event.get("title") or ""),
@@ -59,29 +78,42 @@ def _to_delta_record(event: dict[str, Any]) -> dict[str, Any]:
     }
 
 
-def collect_risk_records(events: list[dict[str, Any]]) -> dict[str, dict[str, Any]]:
-    records: dict[str, dict[str, Any]] = {}
+def _iter_risk_records(events: list[dict[str, Any]]) -> Iterator[dict[str, Any]]:
     for event in events:
-        if str(event.get("severity") or "") not in HIGH_RISK_LEVELS:
-            continue
-        record = _to_delta_record(event)
-        records[record["fingerprint"]] = record
-    return records
+        if str(event.get("severity") or "") in HIGH_RISK_LEVELS:
+            yield _to_delta_record(event)
+
+
+def collect_risk_records(events: list[dict[str, Any]]) -> dict[str, dict[str, Any]]:
+    return {record["fingerprint"]: record for record in _iter_risk_records(events)}
 
 
 def compute_new_resolved(
     today_events: list[dict[str, Any]],
     yesterday_events: list[dict[str, Any]],
 ) -> tuple[list[dict[str, Any]], list[dict[str, Any]], set[str]]:
-    today_records = collect_risk_records(today_events)
-    yesterday_records = collect_risk_records(yesterday_events)
-
-    today_keys = set(today_records.keys())
-    yesterday_keys = set(yesterday_records.keys())
-
-    new_keys = today_keys - yesterday_keys
-    resolved_keys = yesterday_keys - today_keys
-
-    new_risks = [today_records[key] for key in sorted(new_keys)]
-    resolved_risks = [yesterday_records[key] for key in sorted(resolved_keys)]
+    # One map of fingerprint -> (presence flags, latest record) replaces two record maps and
+    # two key sets; a record seen on both days is never emitted, so it may keep either side.
+    seen: dict[str, tuple[int, dict[str, Any]]] = {}
+    for record in _iter_risk_records(yesterday_events):
+        seen[record["fingerprint"]] = (_SEEN_YESTERDAY, record)
+    for record in _iter_risk_records(today_events):
+        key = record["fingerprint"]
+        previous = seen.get(key)
+        flags = _SEEN_TODAY | (previous[0] & _SEEN_YESTERDAY if previous else 0)
+        seen[key] = (flags, record)
+
+    new_risks: list[dict[str, Any]] = []
+    resolved_risks: list[dict[str, Any]] = []
+    today_keys: set[str] = set()
+    for key, (flags, record) in seen.items():
+        if flags & _SEEN_TODAY:
+            today_keys.add(key)
+            if not flags & _SEEN_YESTERDAY:
+                new_risks.append(record)
+        else:
+            resolved_risks.append(record)
+
+    new_risks.sort(key=_fingerprint_of)
+    resolved_risks.sort(key=_fingerprint_of)
     return new_risks, resolved_risks, today_keys
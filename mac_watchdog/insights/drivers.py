@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from collections import Counter
+from operator import itemgetter
 from typing import Any
 
 from mac_watchdog.insights.schemas import RiskDriver
@@ -27,36 +29,38 @@ CATEGORY_ORDER = (
 )
 
 
-def _event_score(event: dict[str, Any], weights: dict[str, int]) -> float:
-    severity = str(event.get("severity") or "INFO").upper()
-    return float(weights.get(severity, 0))
+def _severity_score(severity: Any, weights: dict[str, int]) -> float:
+    return float(weights.get(str(severity or "INFO").upper(), 0))
 
 
 def compute_driver_breakdown(events: list[dict[str, Any]], weights: dict[str, int]) -> list[RiskDriver]:
     raw_scores = {category: 0.0 for category in CATEGORY_ORDER}
-    for event in events:
-        source = str(event.get("source") or "").lower()
-        category = SOURCE_CATEGORY.get(source)
+    # A day holds many events but only a handful of (source, severity) pairs, so events are
+    # tallied per pair in C and each pair is normalised and weighted once.
+    pairs = Counter((event.get("source"), event.get("severity")) for event in events)
+    for (source, severity), count in pairs.items():
+        category = SOURCE_CATEGORY.get(str(source or "").lower())
         if not category:
             continue
-        raw_scores[category] += _event_score(event, weights)
+        raw_scores[category] += count * _severity_score(severity, weights)
 
     total = sum(raw_scores.values())
-    drivers: list[RiskDriver] = []
-    for category in CATEGORY_ORDER:
-        score = raw_scores[category]
-        percent = round((100.0 * score / total), 2) if total > 0 else 0.0
-        drivers.append(
-            RiskDriver(
-                category=category,  # type: ignore[arg-type]
-                score=round(score, 4),
-                percent=percent,
-                explanation=CATEGORY_EXPLANATIONS[category],
-            )
+    ranked = [
+        (category, score, round((100.0 * score / total), 2) if total > 0 else 0.0)
+        for category, score in raw_scores.items()
+    ]
+    # Ordered on plain tuples before any model is built; the stable sort keeps CATEGORY_ORDER
+    # for ties.
+    ranked.sort(key=itemgetter(2), reverse=True)
+    return [
+        RiskDriver(
+            category=category,  # type: ignore[arg-type]
+            score=round(score, 4),
+            percent=percent,
+            explanation=CATEGORY_EXPLANATIONS[category],
         )
-
-    drivers.sort(key=lambda item: item.percent, reverse=True)
-    return drivers
+        for category, score, percent in ranked
+    ]
 
 
 def top_driver(drivers: list[RiskDriver]) -> RiskDriver | None:
@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import json
+from dataclasses import asdict, dataclass, replace
 from datetime import UTC, date, datetime, timedelta
-from statistics import mean
 from typing import Any
 
 from mac_watchdog.config import AppConfig
@@ -88,8 +88,8 @@ class InsightEngine:
         risk_values = [metric.risk_score for metric in recent_metrics]
         high_values = [metric.high_count for metric in recent_metrics]
 
-        avg_risk = mean(risk_values) if risk_values else float(risk_score)
-        avg_high = mean(high_values) if high_values else float(high_count)
+        avg_risk = sum(risk_values) / len(risk_values) if risk_values else float(risk_score)
+        avg_high = sum(high_values) / len(high_values) if high_values else float(high_count)
 
         if risk_score <= avg_risk * 0.9 and high_count <= avg_high * 0.9:
             status = "Improving"
@@ -240,12 +240,49 @@ class InsightEngine:
 
         return insights
 
+    def _reusable_cycle(
+        self, state_key: str, event_watermark: list[int], current: datetime
+    ) -> InsightEngineResult | None:
+        raw = self.db.get_app_state(state_key, trusted=True)
+        if raw is None:
+            return None
+        try:
+            cached = json.loads(raw)
+            age = current - datetime.fromisoformat(cached["ts"])
+            result = InsightEngineResult(**cached["result"])
+        except (ValueError, KeyError, TypeError):
+            return None
+        if cached.get("events") != event_watermark:
+            return None
+        # Any insight written or re-statused since the stored cycle finished (backfill, manual
+        # triage) changes the action queue and brief, so it forces a recompute as well.
+        if cached.get("insights") != list(self.db.get_insight_watermark()):
+            return None
+        # Recomputing at least every half dedup window keeps the open insights' last_seen
+        # fresh, so a later change still updates them instead of opening duplicates.
+        refresh_after = timedelta(minutes=self.insight_service.dedup_window_minutes / 2)
+        if not timedelta(0) <= age < refresh_after:
+            return None
+        # Nothing was generated this time; the risk counts still describe the current day.
+        return replace(result, generated_insights=0)
+
     def generate_cycle(self, now: datetime | None = None) -> InsightEngineResult:
         current = now or datetime.now(UTC)
         current_date = current.date()
         day = current_date.isoformat()
         ts = current.isoformat()
 
+        # Read before the events so a concurrent insert can only make the stored watermark
+        # stale (forcing a recompute), never hide new events behind a reused result.
+        state_key = f"insight_watermark:{day}"
+        event_watermark = [
+            *self.metrics_service.event_watermark(current_date),
+            *self.metrics_service.event_watermark(current_date - timedelta(days=1)),
+        ]
+        reusable = self._reusable_cycle(state_key, event_watermark, current)
+        if reusable is not None:
+            return reusable
+
         today_events = self.metrics_service.events_for_day(current_date)
         yesterday_events = self.metrics_service.events_for_day(current_date - timedelta(days=1))
 
@@ -304,13 +341,27 @@ class InsightEngine:
         self.db.set_app_state("daily_brief_latest", safe_json_dumps(brief.model_dump()))
         self.db.set_app_state(f"daily_delta:{day}", safe_json_dumps(panel.model_dump()))
 
-        return InsightEngineResult(
+        result = InsightEngineResult(
             date=day,
             risk_score=metric.risk_score,
             generated_insights=len(persisted),
             new_risks=len(new_risks),
             resolved_risks=len(resolved_risks),
         )
+        self.db.set_app_state(
+            state_key,
+            safe_json_dumps(
+                {
+                    "ts": ts,
+                    "events": event_watermark,
+                    # Taken after this cycle's own insight writes, so they do not count as changes.
+                    "insights": list(self.db.get_insight_watermark()),
+                    "result": asdict(result),
+                }
+            ),
+            trusted=True,
+        )
+        return result
 
     def run_backfill(self) -> dict[str, int]:
         metric_count = self.metrics_service.backfill_daily_metrics()
@@ -0,0 +1,20 @@
+CREATE TABLE IF NOT EXISTS network_listeners(
+  key TEXT PRIMARY KEY,
+  blob_json TEXT NOT NULL,
+  seen_ts TEXT NOT NULL
+);
+
+INSERT OR REPLACE INTO network_listeners(key, blob_json, seen_ts)
+SELECT
+  json_extract(item.value, '$.ip') || ':' || json_extract(item.value, '$.port') || ':'
+    || coalesce(json_extract(item.value, '$.process_name'), '') || ':'
+    || coalesce(nullif(json_extract(item.value, '$.pid'), 0), ''),
+  item.value,
+  snapshot.ts
+FROM latest_snapshots AS snapshot, json_each(snapshot.blob_json) AS item
+WHERE snapshot.key = 'network_listeners' AND item.type = 'object';
+
+INSERT OR REPLACE INTO app_state(key, value)
+SELECT 'network_listeners_ts', ts FROM latest_snapshots WHERE key = 'network_listeners';
+
+DELETE FROM latest_snapshots WHERE key = 'network_listeners';
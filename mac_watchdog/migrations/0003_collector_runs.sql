@@ -0,0 +1,8 @@
+CREATE TABLE IF NOT EXISTS collector_runs(
+  id INTEGER PRIMARY KEY,
+  ts TEXT NOT NULL,
+  source TEXT NOT NULL,
+  counts_json TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_collector_runs_source_ts ON collector_runs(source, ts);
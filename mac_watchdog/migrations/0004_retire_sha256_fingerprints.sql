@@ -0,0 +1,8 @@
+-- Insight fingerprints moved from 64-hex SHA-256 to 32-hex BLAKE2b keys, so open rows keyed
+-- the old way would never be matched again and would sit beside their re-keyed successors.
+-- Change insights are already swept by resolve_absent_change_insights on the next cycle.
+UPDATE insights
+SET status = 'resolved'
+WHERE status = 'open'
+  AND insight_type != 'change'
+  AND length(fingerprint) = 64;
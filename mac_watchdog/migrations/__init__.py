@@ -7,6 +7,9 @@ from pathlib import Path
 MIGRATION_DIR = Path(__file__).resolve().parent
 MIGRATION_FILES: list[tuple[int, str]] = [
     (1, "0001_daily_metrics_insights.sql"),
+    (2, "0002_network_listeners.sql"),
+    (3, "0003_collector_runs.sql"),
+    (4, "0004_retire_sha256_fingerprints.sql"),
 ]
 
 
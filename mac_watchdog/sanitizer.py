@@ -4,6 +4,8 @@ import json
 import re
 from typing import Any
 
+import orjson
+
 MAX_FIELD_LEN = 4096
 _CONTROL_RE = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]")
 _SECRET_KEY_RE = re.compile(
@@ -61,4 +63,8 @@ def sanitize_jsonable(value: Any) -> Any:
 
 def safe_json_dumps(value: Any) -> str:
     cleaned = sanitize_jsonable(value)
-    return json.dumps(cleaned, ensure_ascii=True, separators=(",", ":"))
+    try:
+        return orjson.dumps(cleaned).decode("utf-8")
+    except orjson.JSONEncodeError:
+        # orjson rejects integers wider than 64 bits; the stdlib encoder does not.
+        return json.dumps(cleaned, ensure_ascii=True, separators=(",", ":"))
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import logging
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime
 from typing import Any
 
@@ -18,6 +19,8 @@ from mac_watchdog.models import EventIn, Severity, Source
 
 logger = logging.getLogger(__name__)
 
+MAX_COLLECTOR_WORKERS = 4
+
 
 class WatchdogScheduler:
     def __init__(self, config: AppConfig, db: Database, verbose: bool = False) -> None:
@@ -27,17 +30,26 @@ class WatchdogScheduler:
         self._filewatch: FileWatchService | None = None
         self._insight_engine = InsightEngine(config=config, db=db)
 
-    def _collect_all(self) -> list[EventIn]:
+    def _collect_all(self) -> tuple[list[EventIn], list[tuple[str, dict[str, Any]]]]:
         events: list[EventIn] = []
+        runs: list[tuple[str, dict[str, Any]]] = []
         collectors = (
             collect_process_events,
             collect_login_events,
             collect_network_events,
         )
-        for collector in collectors:
+        sources = (Source.PROCESS, Source.LOGIN, Source.NETWORK)
+        # Collectors mostly wait on psutil syscalls and the log subprocess, so they overlap well in
+        # threads; their own DB writes are serialized by the Database lock and results are
+        # merged in collector order.
+        with ThreadPoolExecutor(max_workers=min(MAX_COLLECTOR_WORKERS, len(collectors))) as pool:
+            futures = [pool.submit(collector, self.config, self.db) for collector in collectors]
+        for collector, source, future in zip(collectors, sources, futures, strict=True):
             try:
-                result = collector(self.config, self.db)
+                result = future.result()
                 events.extend(result.events)
+                # Run counts go to collector_runs rather than an INFO event per collector.
+                runs.append((source.value, result.metadata))
             except Exception as exc:  # pragma: no cover - defensive top-level guard
                 events.append(
                     EventIn(
@@ -60,11 +72,17 @@ class WatchdogScheduler:
                         details={"error": str(exc)},
                     )
                 )
-        return events
+        return events, runs
 
     def run_once(self) -> dict[str, Any]:
-        events = self._collect_all()
-        inserted = self.db.insert_events(events)
+        events, runs = self._collect_all()
+        now = datetime.now(UTC).isoformat()
+        # The cycle's events and run bookkeeping land in one commit.
+        with self.db.transaction():
+            inserted = self.db.insert_events(events)
+            self.db.record_collector_runs(runs, now)
+            self.db.set_app_state("last_run", now, trusted=True)
+            self.db.set_app_state("last_run_inserted", str(inserted), trusted=True)
 
         insight_summary: dict[str, Any] = {}
         try:
@@ -86,10 +104,6 @@ class WatchdogScheduler:
             )
             insight_summary = {"generated_insights": 0, "error": str(exc)}
 
-        now = datetime.now(UTC).isoformat()
-        self.db.set_app_state("last_run", now)
-        self.db.set_app_state("last_run_inserted", str(inserted))
-
         cycle_counts = {"INFO": 0, "WARN": 0, "HIGH": 0}
         for event in events:
             cycle_counts[event.severity.value] = cycle_counts.get(event.severity.value, 0) + 1
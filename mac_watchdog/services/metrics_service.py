@@ -249,10 +249,17 @@ class MetricsService:
             )
         return history
 
-    def events_for_day(self, date_value: date) -> list[dict[str, Any]]:
+    @staticmethod
+    def _day_bounds(date_value: date) -> tuple[str, str]:
         start = datetime.combine(date_value, time.min, tzinfo=UTC)
         end = start + timedelta(days=1)
-        return self.db.get_events_between(start.isoformat(), end.isoformat())
+        return start.isoformat(), end.isoformat()
+
+    def events_for_day(self, date_value: date) -> list[dict[str, Any]]:
+        return self.db.get_events_between(*self._day_bounds(date_value))
+
+    def event_watermark(self, date_value: date) -> tuple[int, int]:
+        return self.db.get_event_watermark(*self._day_bounds(date_value))
 
     def backfill_daily_metrics(self) -> int:
         row = self.db.fetch_one(
@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import json
 from datetime import UTC, date, datetime, timedelta
-from statistics import mean
 from typing import Any
 
 from fastapi import APIRouter, Query, Request
@@ -100,8 +99,12 @@ def _compute_trend(metrics: list[Any], today_metric: Any) -> dict[str, Any]:
     risk_values = [metric.risk_score for metric in recent]
     high_values = [metric.high_count for metric in recent]
 
-    avg_risk = mean(risk_values) if risk_values else float(today_metric.risk_score)
-    avg_high = mean(high_values) if high_values else float(today_metric.high_count)
+    avg_risk = (
+        sum(risk_values) / len(risk_values) if risk_values else float(today_metric.risk_score)
+    )
+    avg_high = (
+        sum(high_values) / len(high_values) if high_values else float(today_metric.high_count)
+    )
 
     status = "Stable"
     if today_metric.risk_score <= avg_risk * 0.9 and today_metric.high_count <= avg_high * 0.9:
@@ -197,7 +200,8 @@ def overview(request: Request) -> HTMLResponse:
         request,
         "overview.html",
         {
-            "last_run": db.get_app_state("last_run"),
+            "last_run": db.get_app_state("last_run", trusted=True),
+            "collector_runs": db.latest_collector_runs(),
             "daily_brief": daily_brief,
             "action_queue": action_queue,
             "drivers": drivers,
@@ -292,7 +296,7 @@ def events_page(
 @router.get("/listeners", response_class=HTMLResponse)
 def listeners_page(request: Request) -> HTMLResponse:
     db = _get_db(request)
-    snapshot = db.get_latest_snapshot("network_listeners")
+    snapshot = db.get_network_listeners()
     listeners = snapshot["blob"] if snapshot else []
     ts = snapshot["ts"] if snapshot else None
 
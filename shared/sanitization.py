@@ -12,7 +12,8 @@ _EMAIL_RE = re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b")
 def sanitize_text(value: Any, max_len: int = MAX_STRING_LEN) -> str:
     text = str(value)
     text = _CONTROL_RE.sub("", text)
-    text = _EMAIL_RE.sub("[email-redacted]", text)
+    if "@" in text:
+        text = _EMAIL_RE.sub("[email-redacted]", text)
     if len(text) > max_len:
         return text[:max_len]
     return text
@@ -1,19 +1,76 @@
 from __future__ import annotations
 
 import json
+import math
+import re
 from typing import Any
 
+import orjson
 from pydantic import BaseModel
 
+# The canonical form is the stdlib encoding below; signatures are computed over it on both
+# agent and server. orjson matches it byte-for-byte except for non-ASCII/DEL characters (no
+# ensure_ascii) and float exponents/tiny floats, so any output containing those falls back.
+# orjson also writes NaN/Infinity as null, so output with a null is checked for those.
+_ORJSON_OPTIONS = (
+    orjson.OPT_SORT_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+)
+_STDLIB_ONLY_RE = re.compile(rb"[^\x00-\x7e]|\d[eE]|0\.0000")
+
+
+def _has_non_finite(value: Any) -> bool:
+    if isinstance(value, float):
+        return not math.isfinite(value)
+    if isinstance(value, dict):
+        return any(_has_non_finite(item) for item in value.values())
+    if isinstance(value, list | tuple):
+        return any(_has_non_finite(item) for item in value)
+    return False
+
+
+def _stdlib_canonical(payload: Any) -> bytes:
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=True)
+    return encoded.encode("utf-8")
+
 
 def canonical_json_bytes(value: BaseModel | dict[str, Any] | list[Any]) -> bytes:
     if isinstance(value, BaseModel):
         payload: Any = value.model_dump(mode="json")
     else:
         payload = value
-    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=True)
-    return encoded.encode("utf-8")
+    try:
+        encoded = orjson.dumps(payload, option=_ORJSON_OPTIONS)
+    except orjson.JSONEncodeError:
+        return _stdlib_canonical(payload)
+    if _STDLIB_ONLY_RE.search(encoded) or (b"null" in encoded and _has_non_finite(payload)):
+        return _stdlib_canonical(payload)
+    return encoded
 
 
 def canonical_json_text(value: BaseModel | dict[str, Any] | list[Any]) -> str:
     return canonical_json_bytes(value).decode("utf-8")
+
+
+_EVENTS_PLACEHOLDER = b'"events":[]'
+
+
+def canonical_envelope_parts(envelope: dict[str, Any]) -> tuple[bytes, bytes]:
+    """Canonical JSON for ``envelope`` split around where its ``events`` array goes.
+
+    ``prefix + events_blob + suffix`` is the canonical form of the envelope with ``events``
+    set to the already-canonical JSON array ``events_blob``. The placeholder is unique: any
+    quote inside a string value is escaped.
+    """
+    head = canonical_json_bytes({**envelope, "events": []})
+    start = head.index(_EVENTS_PLACEHOLDER) + len(_EVENTS_PLACEHOLDER) - 2
+    return head[:start], head[start + 2 :]
+
+
+def splice_canonical_events(envelope: dict[str, Any], events_blob: bytes) -> bytes:
+    """Canonical JSON for ``envelope`` with ``events`` set to an already-canonical JSON array.
+
+    Lets callers keep event lists pre-encoded (e.g. in the agent spool) without a parse/dump
+    round trip.
+    """
+    prefix, suffix = canonical_envelope_parts(envelope)
+    return prefix + events_blob + suffix
@@ -5,6 +5,7 @@ import hmac
 import json
 import secrets
 import time
+from collections.abc import Iterable
 from typing import Any
 
 from pydantic import BaseModel
@@ -34,11 +35,22 @@ def _body_payload(body: bytes | BaseModel | dict[str, Any] | list[Any]) -> Any:
     return body
 
 
+def sign_canonical_chunks(chunks: Iterable[bytes], api_key: str) -> str:
+    """Signs canonical JSON given as consecutive chunks, without joining or re-parsing them."""
+    digest = hmac.new(api_key.encode("utf-8"), digestmod=hashlib.sha256)
+    for chunk in chunks:
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def sign_canonical_bytes(canonical: bytes, api_key: str) -> str:
+    """Signs bytes that are already in canonical JSON form, without re-parsing them."""
+    return sign_canonical_chunks((canonical,), api_key)
+
+
 def sign_request(body: bytes | BaseModel | dict[str, Any] | list[Any], api_key: str) -> str:
     payload = _body_payload(body)
-    canonical = canonical_json_bytes(payload)
-    digest = hmac.new(api_key.encode("utf-8"), canonical, hashlib.sha256)
-    return digest.hexdigest()
+    return sign_canonical_bytes(canonical_json_bytes(payload), api_key)
 
 
 def build_signed_headers(
@@ -48,10 +60,44 @@ def build_signed_headers(
     device_id: str,
     timestamp: int | None = None,
     nonce: str | None = None,
+) -> dict[str, str]:
+    return _signed_headers(sign_request(body, api_key), org_id, device_id, timestamp, nonce)
+
+
+def build_signed_headers_from_bytes(
+    body: bytes,
+    api_key: str,
+    org_id: str,
+    device_id: str,
+    timestamp: int | None = None,
+    nonce: str | None = None,
+) -> dict[str, str]:
+    """Like build_signed_headers, for a body the caller already encoded canonically."""
+    return build_signed_headers_from_chunks((body,), api_key, org_id, device_id, timestamp, nonce)
+
+
+def build_signed_headers_from_chunks(
+    chunks: Iterable[bytes],
+    api_key: str,
+    org_id: str,
+    device_id: str,
+    timestamp: int | None = None,
+    nonce: str | None = None,
+) -> dict[str, str]:
+    """Like build_signed_headers_from_bytes, for a canonical body split into chunks."""
+    signature = sign_canonical_chunks(chunks, api_key)
+    return _signed_headers(signature, org_id, device_id, timestamp, nonce)
+
+
+def _signed_headers(
+    signature: str,
+    org_id: str,
+    device_id: str,
+    timestamp: int | None,
+    nonce: str | None,
 ) -> dict[str, str]:
     ts = int(time.time()) if timestamp is None else int(timestamp)
     nonce_value = nonce or secrets.token_hex(16)
-    signature = sign_request(body, api_key)
     return {
         HEADER_ORG: org_id,
         HEADER_DEVICE: device_id,
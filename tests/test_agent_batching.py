@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from pathlib import Path
+
+from agent.config import AgentConfig
+from agent.runtime import PendingEvents, _request_size_for, split_batches
+from shared.constants import MAX_PAYLOAD_BYTES
+from shared.enums import Platform, Severity, Source
+from shared.schemas import EventEnvelope
+
+
+def _event(root: Path, index: int, padding: int) -> EventEnvelope:
+    return EventEnvelope(
+        ts=datetime.now(UTC),
+        source=Source.FILEWATCH,
+        severity=Severity.INFO,
+        platform=Platform.MACOS,
+        title="filewatch_new_path",
+        details_json={"path": str(root / f"file-{index}-") + ("x" * padding), "mtime": 1.5},
+    )
+
+
+def test_split_batches_respects_payload_and_count_limits(tmp_path: Path) -> None:
+    config = AgentConfig(device_id="device-1", api_key="key", max_batch_events=50)
+    events = [_event(tmp_path, index, padding=12000) for index in range(200)]
+
+    batches = split_batches(events, config)
+
+    assert [event for batch in batches for event in batch] == events
+    for batch in batches:
+        assert len(batch) <= 50
+        assert _request_size_for(batch, config) <= MAX_PAYLOAD_BYTES
+    for batch, following in zip(batches[:-1], batches[1:], strict=True):
+        grown = batch + following[:1]
+        assert len(grown) > 50 or _request_size_for(grown, config) > MAX_PAYLOAD_BYTES
+
+
+def test_split_batches_keeps_small_cycle_in_one_batch(tmp_path: Path) -> None:
+    config = AgentConfig(device_id="device-1", api_key="key")
+    events = [_event(tmp_path, index, padding=10) for index in range(5)]
+
+    assert split_batches(events, config) == [events]
+    assert split_batches([], config) == []
+
+
+def test_pending_events_flush_on_size_or_age(tmp_path: Path) -> None:
+    config = AgentConfig(
+        device_id="device-1",
+        api_key="key",
+        batch_flush_target_bytes=4096,
+        batch_max_age_seconds=3600,
+    )
+    pending = PendingEvents()
+    assert pending.flush_reason(config) is None
+
+    pending.add([_event(tmp_path, 0, padding=10)])
+    assert pending.flush_reason(config) is None
+
+    pending.add([_event(tmp_path, 1, padding=5000)])
+    assert pending.flush_reason(config) == "size"
+    events, sizes = pending.drain()
+    assert len(events) == len(sizes) == 2
+    assert split_batches(events, config, sizes) == split_batches(events, config)
+
+    immediate = AgentConfig(device_id="device-1", api_key="key")
+    pending.add([_event(tmp_path, 2, padding=10)])
+    assert pending.flush_reason(immediate) == "age"
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from pathlib import Path
+
+from agent.config import AgentConfig
+from agent.sender import Sender
+from agent.spool import Spooler
+from shared.enums import Platform, Severity, Source
+from shared.schemas import EventEnvelope, IngestRequest
+from shared.signing import verify_request
+
+
+def _events() -> list[EventEnvelope]:
+    return [
+        EventEnvelope(
+            ts=datetime.now(UTC),
+            source=Source.AUTH,
+            severity=Severity.WARN,
+            platform=Platform.MACOS,
+            title="macos_failed_login",
+            details_json={"event_type": "failed_login", "username": "zoë", "attempt": index},
+        )
+        for index in range(3)
+    ]
+
+
+def test_spooled_batch_builds_signed_canonical_request(tmp_path: Path) -> None:
+    config = AgentConfig(device_id="device-1", api_key="test-api-key")
+    spooler = Spooler(tmp_path / "spool.db")
+    try:
+        events = _events()
+        spooler.enqueue(events)
+        [batch] = spooler.due_batches()
+        assert batch.event_count == len(events)
+
+        sender = Sender(config)
+        try:
+            body, headers = sender._build_payload(batch)
+        finally:
+            sender.close()
+    finally:
+        spooler.close()
+
+    assert headers["Content-Length"] == str(len(body))
+    assert verify_request(body, headers, "test-api-key")
+    request = IngestRequest.model_validate_json(body)
+    assert request.device_id == "device-1"
+    sent = [event.details_json for event in request.events]
+    assert sent == [event.details_json for event in events]
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import sys
+
+from agent.collectors.common import StreamedCommand
 from agent.platforms.windows.auth import WindowsAuthCollector
 
 
@@ -8,3 +11,16 @@ def test_windows_auth_collector_graceful_without_eventlog() -> None:
     events = collector.collect()
     assert events
     assert events[0].title in {"windows_eventlog_unavailable", "windows_eventlog_access_denied", "windows_failed_login", "windows_successful_login"}
+
+
+def test_streamed_command_waits_for_child_that_exits_after_eof() -> None:
+    # The child closes its stdout pipe, then keeps running briefly before a clean exit.
+    script = (
+        "import os, time; print('a', flush=True); "
+        "os.dup2(os.open(os.devnull, os.O_WRONLY), 1); time.sleep(0.05)"
+    )
+    command = StreamedCommand([sys.executable, "-c", script], timeout_seconds=10)
+    lines = list(command.stdout)
+    assert command.close(stop=False) == 0
+    assert lines == [b"a\n"]
+    assert not command.timed_out
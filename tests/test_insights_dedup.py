@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import UTC, date, datetime, timedelta
 
-from core.dedup import suppress_repeated
+from core.dedup import build_fingerprint, suppress_repeated
 from core.models import Insight
 from shared.enums import Severity, Source
 
@@ -29,3 +29,17 @@ def test_dedup_suppresses_recent_identical_insights() -> None:
     )
     assert accepted == []
     assert suppressed == ["abc123"]
+
+
+def test_fingerprint_ignores_key_order_and_title_spacing() -> None:
+    first = build_fingerprint(
+        "AUTH", "Failed  Login", {"username": "alice", "port": 22, "noise": "x"}
+    )
+    second = build_fingerprint(
+        "auth", " failed login ", {"port": 22, "username": "alice", "noise": "y"}
+    )
+    assert first == second
+    assert len(first) == 32
+    assert build_fingerprint("auth", "failed login", {"port": 22}) != build_fingerprint(
+        "auth", "failed login", {"port": "22"}
+    )
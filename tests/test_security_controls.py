@@ -2,7 +2,16 @@ from __future__ import annotations
 
 import json
 
-from shared.signing import HEADER_NONCE, HEADER_SIGNATURE, HEADER_TIMESTAMP, sign_request, verify_request
+from shared.serialization import canonical_json_bytes
+from shared.signing import (
+    HEADER_NONCE,
+    HEADER_SIGNATURE,
+    HEADER_TIMESTAMP,
+    build_signed_headers_from_bytes,
+    sign_canonical_chunks,
+    sign_request,
+    verify_request,
+)
 
 
 def test_signing_is_stable_for_permuted_keys() -> None:
@@ -25,3 +34,28 @@ def test_verify_rejects_tampered_payload() -> None:
 
     tampered = json.dumps({"a": 1, "b": 999}).encode("utf-8")
     assert not verify_request(tampered, headers, api_key)
+
+
+def test_canonical_json_matches_stdlib_encoding() -> None:
+    payloads = [
+        {"z": 1, "a": [1.5, 1e-05, 1e16, -0.0, None, True], "m": {"b": "x", "a": "y"}},
+        {"user": "héllo", "ctrl": "a\x01b\x7f", "quote": '"\\/'},
+        {"big": 2**70, "neg": -(2**63)},
+        {"nan": float("nan"), "none": None},
+        {"inf": [float("inf"), float("-inf")], "nested": {"x": [None, float("nan")]}},
+    ]
+    for payload in payloads:
+        expected = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=True)
+        assert canonical_json_bytes(payload) == expected.encode("utf-8")
+
+
+def test_bytes_signing_matches_canonical_signing() -> None:
+    payload = {"z": 1, "a": {"k": "vé", "n": 2.5}}
+    body = canonical_json_bytes(payload)
+    headers = build_signed_headers_from_bytes(
+        body, "secret", "org", "device", timestamp=100, nonce="n" * 32
+    )
+    assert headers[HEADER_SIGNATURE] == sign_request(payload, "secret")
+    assert verify_request(body, headers, "secret")
+    chunks = [body[:5], b"", body[5:]]
+    assert sign_canonical_chunks(chunks, "secret") == headers[HEADER_SIGNATURE]
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from mac_watchdog.insights.deltas import collect_risk_records
+
+
+def _listener(port: object) -> dict[str, object]:
+    return {
+        "source": "network",
+        "severity": "WARN",
+        "title": "New localhost listener detected",
+        "details": {"ip": "127.0.0.1", "port": port, "process_name": "python"},
+    }
+
+
+def test_delta_fingerprint_does_not_depend_on_cache_order() -> None:
+    # 1 and True are equal as dict/tuple keys but encode differently.
+    first = set(collect_risk_records([_listener(1)]))
+    second = set(collect_risk_records([_listener(True)]))
+    assert first != second
+    assert set(collect_risk_records([_listener(True), _listener(1)])) == first | second
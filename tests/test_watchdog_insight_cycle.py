@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from mac_watchdog.config import AppConfig
+from mac_watchdog.db import Database
+from mac_watchdog.insights import InsightEngine
+from mac_watchdog.models import EventIn, Severity, Source
+
+NOW = datetime(2026, 3, 2, 12, 0, tzinfo=UTC)
+
+
+def _listener_event(ts: datetime, port: int) -> EventIn:
+    return EventIn(
+        ts=ts.isoformat(),
+        source=Source.NETWORK,
+        severity=Severity.WARN,
+        title="New localhost listener detected",
+        details={"ip": "127.0.0.1", "port": port, "process_name": "python"},
+    )
+
+
+@pytest.fixture()
+def cycle(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    db = Database(tmp_path / "watchdog.db")
+    engine = InsightEngine(config=AppConfig(), db=db)
+    loads: list[object] = []
+    events_for_day = engine.metrics_service.events_for_day
+
+    def counting_events_for_day(date_value):  # type: ignore[no-untyped-def]
+        loads.append(date_value)
+        return events_for_day(date_value)
+
+    monkeypatch.setattr(engine.metrics_service, "events_for_day", counting_events_for_day)
+    db.insert_events([_listener_event(NOW - timedelta(minutes=5), 8080)])
+    yield engine, db, loads
+    db.close()
+
+
+def test_unchanged_watermark_reuses_cycle_without_generating(cycle) -> None:
+    engine, _, loads = cycle
+    first = engine.generate_cycle(NOW)
+    assert first.generated_insights > 0
+    computed = len(loads)
+
+    reused = engine.generate_cycle(NOW + timedelta(minutes=1))
+    assert len(loads) == computed
+    assert reused.generated_insights == 0
+    assert (reused.risk_score, reused.new_risks) == (first.risk_score, first.new_risks)
+
+
+def test_new_events_or_insight_changes_force_recompute(cycle) -> None:
+    engine, db, loads = cycle
+    engine.generate_cycle(NOW)
+
+    computed = len(loads)
+    db.insert_events([_listener_event(NOW + timedelta(minutes=1), 9090)])
+    result = engine.generate_cycle(NOW + timedelta(minutes=2))
+    assert len(loads) > computed
+    assert result.generated_insights > 0
+
+    computed = len(loads)
+    db.execute("UPDATE insights SET status = 'acknowledged' WHERE status = 'open'")
+    engine.generate_cycle(NOW + timedelta(minutes=3))
+    assert len(loads) > computed
+
+
+def test_reuse_expires_after_half_the_dedup_window(cycle) -> None:
+    engine, _, loads = cycle
+    engine.generate_cycle(NOW)
+    window = engine.insight_service.dedup_window_minutes
+
+    computed = len(loads)
+    engine.generate_cycle(NOW + timedelta(minutes=window / 2 - 1))
+    assert len(loads) == computed
+
+    engine.generate_cycle(NOW + timedelta(minutes=window / 2))
+    assert len(loads) > computed